@@ -1,67 +1,249 @@
 import os
-import fnmatch
+import re
+import sys
 from pathlib import Path
-from typing import List, Set
-from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import argparse
 
+# Matches the start of every line that holds at least one non-whitespace
+# character. Lines end at '\n', '\r\n' or a lone '\r', as in text-mode reads
+NON_BLANK_LINE_RE = re.compile(r'(?:^|(?<=\r))[^\S\r\n]*\S', re.MULTILINE)
+
+def _translate_segment(segment: str) -> str:
+    """Translate one gitignore path segment (no slashes) to a regex"""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '\\' and i < n:
+            out.append(re.escape(segment[i]))
+            i += 1
+        elif c == '[':
+            end = segment.find(']', i + 1 if i < n and segment[i] in '!^' else i)
+            if end == -1:
+                out.append('\\[')
+                continue
+            body = segment[i:end].replace('\\', '\\\\')
+            if body[:1] in ('!', '^'):
+                body = '^' + body[1:]
+            out.append(f'[{body}]')
+            i = end + 1
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+def translate_gitignore_pattern(pattern: str) -> str:
+    """Translate a gitignore pattern to a regex matching paths relative to its .gitignore.
+
+    Paths are '/' separated and directories carry a trailing '/'. A pattern
+    also matches everything below a directory it matches.
+    """
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    # A slash anywhere but the end anchors the pattern to the .gitignore directory
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    segments = pattern.split('/')
+    parts = []
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == '**':
+            parts.append('.*' if last else '(?:.*/)?')
+        else:
+            parts.append(_translate_segment(segment) + ('' if last else '/'))
+
+    prefix = '' if anchored else '(?:.*/)?'
+    suffix = '/.*' if dir_only else '(?:/.*)?'
+    return f"{prefix}{''.join(parts)}{suffix}\\Z"
+
+
+class IgnoreRuleSet:
+    """Compiled rules of a single .gitignore file, in file order"""
+
+    def __init__(self, lines: List[str]):
+        patterns: List[Tuple[str, bool]] = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            elif line.startswith(('\\!', '\\#')):
+                line = line[1:]
+            if line and line != '/':
+                patterns.append((line, negate))
+        
+        self.rules: List[Tuple[re.Pattern, bool]] = [
+            (re.compile(translate_gitignore_pattern(pattern), re.DOTALL), negate)
+            for pattern, negate in patterns
+        ]
+        
+        # With negations the last matching rule wins, so rules are checked in order
+        self._ordered = any(negate for _, negate in patterns)
+        
+        # Without negations order does not matter: plain names and '*.ext'
+        # globs are answered by set lookups, everything else by one regex
+        self._names = set()
+        self._dir_names = set()
+        self._extensions = set()
+        self._combined = None
+        if not self._ordered:
+            complex_patterns = []
+            for pattern, _ in patterns:
+                name = pattern.rstrip('/')
+                if '/' in name:
+                    complex_patterns.append(pattern)
+                elif not any(c in name for c in '*?[\\'):
+                    (self._dir_names if pattern.endswith('/') else self._names).add(name)
+                elif name.startswith('*.') and name[2:].isalnum() and not pattern.endswith('/'):
+                    self._extensions.add(name[1:])
+                else:
+                    complex_patterns.append(pattern)
+            if complex_patterns:
+                self._combined = re.compile(
+                    '|'.join(f'(?:{translate_gitignore_pattern(p)})' for p in complex_patterns), re.DOTALL)
+
+    def _match_simple(self, rel_path: str) -> bool:
+        """Check rel_path against the plain name and extension rules"""
+        parts = rel_path.split('/')
+        # Every part but the last is a directory; a trailing '/' leaves an
+        # empty last part, making rel_path itself a directory
+        dir_count = len(parts) - 1
+        if not parts[-1]:
+            parts.pop()
+        for i, part in enumerate(parts):
+            if part in self._names:
+                return True
+            if i < dir_count and part in self._dir_names:
+                return True
+            dot = part.rfind('.')
+            if dot != -1 and part[dot:] in self._extensions:
+                return True
+        return False
+
+    def match(self, rel_path: str) -> Optional[bool]:
+        """Return True if ignored, False if re-included by a negation, None if no rule matches"""
+        if not self._ordered:
+            if (self._names or self._dir_names or self._extensions) and self._match_simple(rel_path):
+                return True
+            if self._combined is not None and self._combined.match(rel_path):
+                return True
+            return None
+        # The last matching rule wins
+        for regex, negate in reversed(self.rules):
+            if regex.match(rel_path):
+                return not negate
+        return None
+
+
+# Extensions of binary and generated files that are never counted
+BINARY_EXTENSIONS = frozenset(['pyc', 'pyo', 'pyd', 'so', 'dll', 'exe'])
+
 class CodeAnalyzer:
-    def __init__(self, root_dir: str, verbose: bool = False):
+    # Directories that are never descended into
+    COMMON_IGNORED_DIRS = frozenset([
+        'node_modules', '__pycache__', '.git', '.pytest_cache',
+        'venv', 'env', 'ENV', '.env', '.venv',
+    ])
+
+    def __init__(self, root_dir: str, verbose: bool = False, max_workers: Optional[int] = None):
         self.root_dir = Path(root_dir)
         self.verbose = verbose
-        self.ignored_patterns = self._get_ignored_patterns()
+        self.max_workers = max_workers or self._default_workers()
+        self._rules = self._load_ignore_rules()
         self.stats = {
             'total_files': 0,
             'total_lines': 0,
-            'files_by_type': defaultdict(int),
-            'lines_by_type': defaultdict(int)
+            'files_by_type': Counter(),
+            'lines_by_type': Counter()
         }
         
+    @staticmethod
+    def _default_workers() -> int:
+        """Pick a thread count for the line counting pool"""
+        # APFS serializes directory reads, so extra threads do not help on macOS
+        if sys.platform == 'darwin':
+            return 4
+        return min(32, (os.cpu_count() or 1) * 4)
+
     def log(self, message: str):
         """Print message only if verbose mode is enabled"""
         if self.verbose:
             print(message)
 
+    def _iter_tree(self, root: str, prune_ignored: bool = False):
+        """Yield (DirEntry, rel_path) for every file below root.
+
+        Directories are walked with an explicit stack. Common ignored
+        directories are never entered, and when prune_ignored is set any
+        directory matched by the ignore patterns is skipped as a whole.
+        """
+        stack = [(root, '')]
+        while stack:
+            dir_path, rel_root = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError as e:
+                self.log(f"Warning: Could not scan {dir_path}: {e}")
+                continue
+
+            for entry in entries:
+                rel_path = f"{rel_root}/{entry.name}" if rel_root else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in self.COMMON_IGNORED_DIRS:
+                            self.log(f"Skipping common ignored directory: {rel_path}")
+                        elif prune_ignored and self._should_ignore(rel_path + '/'):
+                            self.log(f"Skipping ignored directory: {rel_path}")
+                        else:
+                            stack.append((entry.path, rel_path))
+                    elif entry.is_file():
+                        yield entry, rel_path
+                except OSError:
+                    continue
+
     def _find_gitignore_files(self) -> List[Path]:
         """Find all .gitignore files in the project"""
         gitignore_files = []
-        for root, _, files in os.walk(self.root_dir):
-            if '.gitignore' in files:
-                gitignore_path = Path(root) / '.gitignore'
+        for entry, _ in self._iter_tree(str(self.root_dir)):
+            if entry.name == '.gitignore':
+                gitignore_path = Path(entry.path)
                 gitignore_files.append(gitignore_path)
                 self.log(f"Found .gitignore: {gitignore_path}")
         return gitignore_files
 
-    def _get_ignored_patterns(self) -> Set[str]:
-        """Get patterns to ignore from all .gitignore files and add custom patterns"""
-        patterns = set()
+    def _load_ignore_rules(self) -> Dict[str, IgnoreRuleSet]:
+        """Load the rules of every .gitignore file, keyed by its directory relative to the root"""
+        rules = {}
         
-        # Add custom patterns for .txt and .md files
-        patterns.add('*.txt')
-        patterns.add('*.md')
-        
-        # Read patterns from all .gitignore files
         for gitignore_path in self._find_gitignore_files():
             try:
                 with open(gitignore_path, 'r', encoding='utf-8') as f:
-                    # Get relative path to make patterns relative to gitignore location
-                    rel_dir = os.path.relpath(gitignore_path.parent, self.root_dir)
-                    if rel_dir == '.':
-                        rel_dir = ''
-                        
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            # Make pattern relative to gitignore location
-                            if rel_dir and not any(c in line for c in ['/', '*', '$']):
-                                patterns.add(os.path.join(rel_dir, line).replace('\\', '/'))
-                            else:
-                                patterns.add(line)
+                    rule_set = IgnoreRuleSet(f.readlines())
             except Exception as e:
                 self.log(f"Warning: Could not read {gitignore_path}: {e}")
+                continue
+            
+            # Rules only apply below the directory holding the .gitignore
+            rel_dir = os.path.relpath(gitignore_path.parent, self.root_dir).replace('\\', '/')
+            if rel_dir == '.':
+                rel_dir = ''
+            if rule_set.rules:
+                rules[rel_dir] = rule_set
         
-        return patterns
+        return rules
 
     def _should_ignore(self, path: str) -> bool:
         """Check if a path should be ignored based on patterns"""
@@ -72,55 +254,44 @@ class CodeAnalyzer:
         if path.endswith(('.txt', '.md')):
             return True
             
-        # Common patterns to always ignore
-        common_ignores = [
-            '__pycache__', 
-            '.git', 
-            'node_modules', 
-            '.pytest_cache',
-            'venv',
-            'env',
-            'ENV',
-            '.env',
-            '.venv',
-            'node_modules',
-        ]
-        if any(pattern in path for pattern in common_ignores):
+        # Paths inside a common ignored directory; whole path components
+        # only, so names like 'environment.py' or 'venv_notes' are kept
+        if not self.COMMON_IGNORED_DIRS.isdisjoint(path.split('/')):
             return True
             
         # Skip binary and generated files
         if path.endswith(('.pyc', '.pyo', '.pyd', '.so', '.dll', '.exe')):
             return True
             
-        # For other patterns, be more selective
-        for pattern in self.ignored_patterns:
-            pattern = pattern.replace('\\', '/')
-            
-            # Skip complex patterns that might be too aggressive
-            if pattern.startswith('**/') or pattern == '*':
-                continue
-                
-            # Handle directory-specific patterns
-            if '/' in pattern:
-                if pattern.startswith('/'):
-                    pattern = pattern[1:]
-                if fnmatch.fnmatch(path, pattern):
-                    self.log(f"Ignored by pattern '{pattern}': {path}")
-                    return True
-            else:
-                # For simple patterns, only match against filename
-                filename = path.split('/')[-1]
-                if fnmatch.fnmatch(filename, pattern):
-                    self.log(f"Ignored by pattern '{pattern}': {path}")
-                    return True
+        # Apply .gitignore rules from the root down to the deepest directory,
+        # deeper rules overriding shallower ones
+        ignored = False
+        rel_dir, rest = '', path
+        while True:
+            rule_set = self._rules.get(rel_dir)
+            if rule_set is not None:
+                verdict = rule_set.match(rest)
+                if verdict is not None:
+                    ignored = verdict
+            head, _, rest = rest.partition('/')
+            if not rest:
+                break
+            rel_dir = f"{rel_dir}/{head}" if rel_dir else head
+        
+        if ignored:
+            self.log(f"Ignored by .gitignore rule: {path}")
+            return True
         
         return False
 
-    def _count_lines(self, file_path: Path) -> int:
+    def _count_lines(self, file_path: str) -> int:
         """Count non-empty lines in a file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return sum(1 for line in f if line.strip())
+            with open(file_path, 'rb') as f:
+                # Non UTF-8 files are treated as binary and not counted
+                text = f.read().decode('utf-8')
+            # Lines are counted on the decoded text, without splitting it
+            return sum(1 for _ in NON_BLANK_LINE_RE.finditer(text))
         except (UnicodeDecodeError, Exception):
             return 0
 
@@ -128,46 +299,51 @@ class CodeAnalyzer:
         """Analyze the codebase and collect statistics"""
         self.log(f"\nAnalyzing directory: {self.root_dir}")
         
-        for root, dirs, files in os.walk(self.root_dir):
-            rel_path = os.path.relpath(root, self.root_dir)
-            
-            # Skip common ignored directories
-            common_dirs = ['node_modules', '__pycache__', '.git', 'venv', 'env', 'ENV', '.env', '.venv']
-            if any(d in rel_path for d in common_dirs):
-                self.log(f"Skipping common ignored directory: {rel_path}")
-                continue
-                
-            for file in files:
-                file_path = Path(root) / file
-                rel_file_path = os.path.relpath(file_path, self.root_dir)
-                
+        # Keep a bounded number of reads in flight so memory stays flat
+        max_in_flight = self.max_workers * 4
+        pending = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for entry, rel_file_path in self._iter_tree(str(self.root_dir), prune_ignored=True):
                 # Skip ignored files
                 if self._should_ignore(rel_file_path):
                     self.log(f"Skipping ignored file: {rel_file_path}")
                     continue
                 
-                # Get file extension
-                ext = file_path.suffix.lower() or 'no_extension'
-                if ext.startswith('.'):
-                    ext = ext[1:]
+                # Get file extension (same rules as Path.suffix, without building a Path)
+                name = entry.name
+                dot = name.rfind('.')
+                ext = name[dot + 1:].lower() if 0 < dot < len(name) - 1 else 'no_extension'
                 
                 # Skip binary and generated files
-                if ext in ['pyc', 'pyo', 'pyd', 'so', 'dll', 'exe']:
+                if ext in BINARY_EXTENSIONS:
                     continue
                 
-                try:
-                    # Count lines
-                    lines = self._count_lines(file_path)
-                    
-                    # Update statistics
-                    self.stats['total_files'] += 1
-                    self.stats['total_lines'] += lines
-                    self.stats['files_by_type'][ext] += 1
-                    self.stats['lines_by_type'][ext] += lines
-                    
-                    self.log(f"Analyzed: {rel_file_path} ({lines} lines)")
-                except Exception as e:
-                    self.log(f"Error analyzing {rel_file_path}: {e}")
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record_result(future, *pending.pop(future))
+                
+                pending[executor.submit(self._count_lines, entry.path)] = (rel_file_path, ext)
+            
+            for future in list(pending):
+                self._record_result(future, *pending.pop(future))
+
+    def _record_result(self, future, rel_file_path: str, ext: str):
+        """Fold the line count of one analyzed file into the statistics"""
+        try:
+            # Count lines
+            lines = future.result()
+            
+            # Update statistics
+            self.stats['total_files'] += 1
+            self.stats['total_lines'] += lines
+            self.stats['files_by_type'][ext] += 1
+            self.stats['lines_by_type'][ext] += lines
+            
+            self.log(f"Analyzed: {rel_file_path} ({lines} lines)")
+        except Exception as e:
+            self.log(f"Error analyzing {rel_file_path}: {e}")
 
     def get_report(self) -> str:
         """Generate a formatted report of the analysis"""
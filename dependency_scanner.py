@@ -1,25 +1,30 @@
 import argparse
+import ast
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Set, List
 
 ## python dependency_scanner.py --input context/ --output dependencies.txt
 
 class DependencyScanner:
+    # Files that are read for import statements
+    SOURCE_EXTENSIONS = ('.py', '.txt')
+    
+    # Directories that never hold the project's own sources
+    SKIPPED_DIRS = frozenset(['.git', 'node_modules', '__pycache__', '.venv', 'venv'])
+    
+    # Python standard library modules, filtered out of the results
+    _STDLIB = frozenset(sys.stdlib_module_names)
+    
     def __init__(self):
-        # Initialize with Python standard library modules to filter them out
-        self.std_lib_modules = self._get_standard_library_modules()
-        
         # Regex patterns for different import styles
         self.import_patterns = [
             r'^import\s+([\w\s,]+)(?:\s+as\s+\w+)?$',  # import pandas as pd, numpy as np
             r'^from\s+([\w\.]+)\s+import\s+[\w\s,\*]+$',  # from datetime import datetime
         ]
-    
-    def _get_standard_library_modules(self) -> Set[str]:
-        """Get a set of Python standard library module names."""
-        return set(sys.stdlib_module_names)
+        self._compiled_patterns = [re.compile(pattern) for pattern in self.import_patterns]
     
     def _clean_module_name(self, module: str) -> str:
         """Clean module name by removing whitespace and getting base module."""
@@ -27,24 +32,49 @@ class DependencyScanner:
         # Get base module name (e.g., 'pandas.core' -> 'pandas')
         return module.split('.')[0]
     
+    def _add_module(self, dependencies: Set[str], module: str):
+        """Add the base module to dependencies unless it is part of the standard library."""
+        base_module = self._clean_module_name(module)
+        if base_module and base_module not in self._STDLIB:
+            dependencies.add(base_module)
+    
     def extract_dependencies(self, content: str) -> Set[str]:
         """Extract Python dependencies from text content."""
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            # Not valid Python source (e.g. a text dump), fall back to line matching
+            return self._extract_dependencies_by_line(content)
+        
+        dependencies = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self._add_module(dependencies, alias.name)
+            elif isinstance(node, ast.ImportFrom):
+                # Relative imports refer to the scanned project itself
+                if node.level == 0 and node.module:
+                    self._add_module(dependencies, node.module)
+        
+        return dependencies
+    
+    def _extract_dependencies_by_line(self, content: str) -> Set[str]:
+        """Extract Python dependencies by matching import statements line by line."""
         dependencies = set()
         
         for line in content.splitlines():
             line = line.strip()
-            if not line or line.startswith('#'):
+            # Only lines starting with an import keyword can match
+            if not line.startswith(('import', 'from')):
                 continue
                 
-            for pattern in self.import_patterns:
-                matches = re.match(pattern, line)
+            for pattern in self._compiled_patterns:
+                matches = pattern.match(line)
                 if matches:
                     # Extract module names from the match
                     modules = matches.group(1).split(',')
                     for module in modules:
-                        base_module = self._clean_module_name(module)
-                        if base_module and base_module not in self.std_lib_modules:
-                            dependencies.add(base_module)
+                        self._add_module(dependencies, module)
         
         return dependencies
     
@@ -58,31 +88,45 @@ class DependencyScanner:
             print(f"Error scanning file {file_path}: {str(e)}", file=sys.stderr)
             return set()
     
-    def scan_directory(self, dir_path: str) -> Set[str]:
-        """Recursively scan directory for .txt files and extract dependencies."""
-        all_dependencies = set()
+    def _find_source_files(self, dir_path: str) -> List[str]:
+        """Recursively collect .py and .txt files, skipping vendored directories."""
+        paths = []
+        stack = [dir_path]
+        
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.SKIPPED_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(self.SOURCE_EXTENSIONS) and entry.is_file():
+                            paths.append(entry.path)
+            except OSError as e:
+                print(f"Error scanning directory {current}: {str(e)}", file=sys.stderr)
         
-        for root, _, files in os.walk(dir_path):
-            for file in files:
-                if file.endswith('.txt'):
-                    file_path = os.path.join(root, file)
-                    dependencies = self.scan_file(file_path)
-                    all_dependencies.update(dependencies)
+        return paths
+    
+    def scan_directory(self, dir_path: str) -> Set[str]:
+        """Recursively scan directory for .py and .txt files and extract dependencies."""
+        paths = self._find_source_files(dir_path)
         
-        return all_dependencies
+        with ThreadPoolExecutor() as executor:
+            results = executor.map(self.scan_file, paths)
+            return set().union(*results)
     
     def save_dependencies(self, dependencies: Set[str], output_file: str):
         """Save dependencies to output file."""
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
-                for dep in sorted(dependencies):
-                    f.write(f"{dep}\n")
+                f.write(''.join(f"{dep}\n" for dep in sorted(dependencies)))
             print(f"Dependencies saved to {output_file}")
         except Exception as e:
             print(f"Error saving dependencies: {str(e)}", file=sys.stderr)
 
 def main():
-    parser = argparse.ArgumentParser(description='Scan text files for Python dependencies.')
+    parser = argparse.ArgumentParser(description='Scan Python and text files for Python dependencies.')
     parser.add_argument('--input', required=True, help='Input file or directory path')
     parser.add_argument('--output', required=True, help='Output file path for dependencies')
     args = parser.parse_args()
@@ -5,13 +5,20 @@ This wrapper applies security restrictions to the executed script.
 """
 import sys
 import os
+import re
 import json
 import importlib
 import importlib.util
 import types
 import builtins
+import bisect
+import functools
 import io
+import socket
+import urllib.request
+import http.client
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Default security profile if none provided
 DEFAULT_SECURITY_PROFILE = {
@@ -35,6 +42,26 @@ DEFAULT_SECURITY_PROFILE = {
     }
 }
 
+# Modules that should never be imported regardless of allowlist
+DANGEROUS_MODULES = [
+    'subprocess', 'os.system', 'shutil.rmtree', 'pty',
+    'socket', 'smtplib', 'ftplib'
+]
+
+# Matches a dangerous module or any of its submodules, but not e.g. 'socketserver'
+DANGEROUS_MODULES_RE = re.compile(r'(?:' + '|'.join(map(re.escape, DANGEROUS_MODULES)) + r')(?:\.|$)')
+
+# open() mode strings seen so far, mapped to whether they allow writing
+_WRITE_MODES = {}
+
+def is_write_mode(mode):
+    """Return True if an open() mode string allows writing."""
+    write_mode = _WRITE_MODES.get(mode)
+    if write_mode is None:
+        write_mode = 'w' in mode or 'a' in mode or 'x' in mode or '+' in mode
+        _WRITE_MODES[mode] = write_mode
+    return write_mode
+
 class SecurityError(Exception):
     """Exception raised for security violations."""
     pass
@@ -43,6 +70,9 @@ class RestrictedImportHook:
     """Import hook that restricts which modules can be imported."""
     def __init__(self, allowed_imports):
         self.allowed_imports = allowed_imports
+        self._allowed = frozenset(allowed_imports)
+        # Names that already passed the policy checks
+        self._approved = set()
         self.original_import = builtins.__import__
         
     def __enter__(self):
@@ -53,24 +83,23 @@ class RestrictedImportHook:
         builtins.__import__ = self.original_import
         
     def secure_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if name in self._approved:
+            return self.original_import(name, globals, locals, fromlist, level)
+            
         # Check if the module or its parent package is allowed
-        module_parts = name.split('.')
-        base_module = module_parts[0]
+        base_module = name.partition('.')[0]
         
-        if base_module not in self.allowed_imports and name not in self.allowed_imports:
+        if base_module not in self._allowed and name not in self._allowed:
             print(f"Security violation: Attempted to import restricted module '{name}'", file=sys.stderr)
             raise SecurityError(f"Import of '{name}' is not allowed")
             
-        # Special case for known dangerous modules that should never be imported regardless of allowlist
-        dangerous_modules = [
-            'subprocess', 'os.system', 'shutil.rmtree', 'pty', 
-            'socket', 'smtplib', 'ftplib'
-        ]
-        
-        if any(name.startswith(dangerous) for dangerous in dangerous_modules):
+        # Known dangerous modules are never imported regardless of allowlist
+        if DANGEROUS_MODULES_RE.match(name):
             print(f"Security violation: Attempted to import dangerous module '{name}'", file=sys.stderr)
             raise SecurityError(f"Import of '{name}' is not allowed for security reasons")
             
+        self._approved.add(name)
+        
         # Allow the import to proceed with the original import function
         return self.original_import(name, globals, locals, fromlist, level)
 
@@ -81,9 +110,25 @@ class RestrictedFileSystem:
         self.write_paths = [os.path.abspath(p) for p in write_paths]
         self.allow_delete = allow_delete
         
+        # An allowed path grants itself and everything below it; the trailing
+        # separator keeps '/data' from also granting '/database'
+        self._read_rules = self._build_rules(self.read_paths)
+        self._write_rules = self._build_rules(self.write_paths)
+        self._check_path = functools.lru_cache(maxsize=4096)(self._check_path_uncached)
+        
         # Save original functions
         self.original_open = builtins.open
         
+    @staticmethod
+    def _build_rules(paths):
+        """Split allowed paths into exact matches and sorted directory prefixes."""
+        prefixes = []
+        for prefix in sorted(p if p.endswith(os.sep) else p + os.sep for p in paths):
+            # Prefixes nested in an already allowed directory are redundant
+            if not prefixes or not prefix.startswith(prefixes[-1]):
+                prefixes.append(prefix)
+        return frozenset(paths), prefixes
+        
     def __enter__(self):
         builtins.open = self.secure_open
         # Also restrict pathlib operations
@@ -102,26 +147,28 @@ class RestrictedFileSystem:
         """Check if a file path is allowed based on permissions."""
         filepath = os.path.abspath(filepath)
         
-        # First check write paths if in write mode
-        if write_mode:
-            for allowed_path in self.write_paths:
-                if filepath.startswith(allowed_path):
-                    return True
-            print(f"Security violation: Write access denied to '{filepath}'", file=sys.stderr)
-            return False
+        if self._check_path(filepath, write_mode):
+            return True
             
-        # Then check read paths
-        for allowed_path in self.read_paths:
-            if filepath.startswith(allowed_path):
-                return True
-                
-        print(f"Security violation: Read access denied to '{filepath}'", file=sys.stderr)
+        access = 'Write' if write_mode else 'Read'
+        print(f"Security violation: {access} access denied to '{filepath}'", file=sys.stderr)
         return False
         
+    def _check_path_uncached(self, filepath, write_mode):
+        """Check an absolute path against the write or read allowlist."""
+        # Write paths are checked in write mode, read paths otherwise
+        exact, prefixes = self._write_rules if write_mode else self._read_rules
+        if filepath in exact:
+            return True
+        # With nested prefixes removed, only the closest prefix sorting
+        # at or before the path can contain it
+        index = bisect.bisect_right(prefixes, filepath)
+        return index > 0 and filepath.startswith(prefixes[index - 1])
+        
     def secure_open(self, file, mode='r', *args, **kwargs):
         """Secure version of open() that checks permissions."""
         # Determine if this is a write operation
-        write_mode = any(char in mode for char in 'wax+')
+        write_mode = is_write_mode(mode)
         
         if not self.is_path_allowed(file, write_mode):
             raise SecurityError(f"Access to file '{file}' {'for writing ' if write_mode else ''}is not allowed")
@@ -131,7 +178,7 @@ class RestrictedFileSystem:
     def secure_path_open(self, path_self, mode='r', *args, **kwargs):
         """Secure version of Path.open() that checks permissions."""
         filepath = str(path_self)
-        write_mode = any(char in mode for char in 'wax+')
+        write_mode = is_write_mode(mode)
         
         if not self.is_path_allowed(filepath, write_mode):
             raise SecurityError(f"Access to file '{filepath}' {'for writing ' if write_mode else ''}is not allowed")
@@ -151,38 +198,28 @@ class RestrictedNetwork:
         self.allow_localhost = allow_localhost
         
     def __enter__(self):
-        # Try to patch socket if it exists
-        try:
-            import socket
-            self.original_socket = socket.socket
-            socket.socket = self.secure_socket
-            
-            # Try to patch common network libraries
-            try:
-                import urllib.request
-                self.original_urlopen = urllib.request.urlopen
-                urllib.request.urlopen = self.secure_urlopen
-            except (ImportError, AttributeError):
-                pass
-                
-            try:
-                import http.client
-                self.original_http_connect = http.client.HTTPConnection.__init__
-                http.client.HTTPConnection.__init__ = self.secure_http_connect
-            except (ImportError, AttributeError):
-                pass
-        except ImportError:
-            pass
+        # Network modules are imported at module level, before the import
+        # hook is installed, so patching them never goes through the hook
+        self.original_socket = socket.socket
+        socket.socket = self.secure_socket
+        
+        # Patch common network libraries
+        self.original_urlopen = urllib.request.urlopen
+        urllib.request.urlopen = self.secure_urlopen
+        
+        self.original_http_connect = http.client.HTTPConnection.__init__
+        http.client.HTTPConnection.__init__ = self.secure_http_connect
             
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         # Restore original functions if we patched them
-        try:
-            import socket
+        if hasattr(self, 'original_socket'):
             socket.socket = self.original_socket
-        except (ImportError, AttributeError):
-            pass
+        if hasattr(self, 'original_urlopen'):
+            urllib.request.urlopen = self.original_urlopen
+        if hasattr(self, 'original_http_connect'):
+            http.client.HTTPConnection.__init__ = self.original_http_connect
             
     def is_host_allowed(self, host):
         """Check if a host is allowed based on permissions."""
@@ -214,8 +251,6 @@ class RestrictedNetwork:
         
     def secure_urlopen(self, url, *args, **kwargs):
         """Secure version of urllib.request.urlopen that enforces network restrictions."""
-        from urllib.parse import urlparse
-        
         parsed_url = urlparse(url)
         host = parsed_url.netloc.split(':')[0]
         port = parsed_url.port or (443 if parsed_url.scheme == 'https' else 80)
@@ -321,8 +356,8 @@ def run_sandboxed_script(script_path, security_profile):
             '__file__': script_path,
         }
         
-        # Read the script content
-        with open(script_path, 'r') as f:
+        # Read the script as bytes; compile() decodes it honouring any PEP 263 coding cookie
+        with open(script_path, 'rb') as f:
             script_content = f.read()
             
         # Execute the script in the restricted environment
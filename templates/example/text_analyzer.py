@@ -8,16 +8,208 @@ Analyzes text files for various statistics including:
 - Word count
 - Character count
 - Average word length
+- Sentence count
 - Most common words
 """
 
 import collections
+import glob
+import heapq
+import io
+import os
 import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter, mul
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
 
 from ..script_template import ScriptBase
 
+# Word tokenizer, compiled once and reused for every analyzed file
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Newline-terminated lines holding only whitespace
+_EMPTY_LINE_RE = re.compile(r'^[^\S\n]*\n', re.MULTILINE)
+
+# Sentence boundary: whitespace after terminal punctuation followed by a
+# capital letter, or a blank line
+_SENT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])|(?:\r?\n){2,}')
+
+# Read buffer for input files, well above io.DEFAULT_BUFFER_SIZE
+READ_BUFFER_SIZE = 1 << 20
+
+# Files larger than this are streamed instead of read in one go
+BULK_READ_LIMIT = 64 << 20
+
+# Number of most common words reported
+TOP_WORDS = 10
+
+def _read_blocks(f) -> Iterator[str]:
+    """
+    Yield consecutive blocks of whole lines of about READ_BUFFER_SIZE characters.
+    
+    The file is read in fixed-size chunks; the partial line after the last
+    newline of a chunk is carried over to the next one, so no word or line
+    is split across blocks.
+    """
+    tail = ''
+    while True:
+        chunk = f.read(READ_BUFFER_SIZE)
+        if not chunk:
+            break
+        chunk = tail + chunk
+        cut = chunk.rfind('\n') + 1
+        if cut:
+            tail = chunk[cut:]
+            yield chunk[:cut]
+        else:
+            tail = chunk
+    if tail:
+        yield tail
+
+def _iter_file_blocks(path: str) -> Iterator[str]:
+    """
+    Yield the text of a file as blocks of whole lines.
+    
+    Files up to BULK_READ_LIMIT bytes are read with os.read calls sized to
+    the file and decoded at once; larger files are streamed so memory
+    stays bounded.
+    """
+    size = os.stat(path).st_size
+    if size > BULK_READ_LIMIT:
+        with open(path, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as f:
+            yield from _read_blocks(f)
+        return
+        
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        remaining = size
+        # Loop in case the file grows or the kernel returns a short read
+        while True:
+            chunk = os.read(fd, max(remaining, READ_BUFFER_SIZE))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+    finally:
+        os.close(fd)
+        
+    content = b''.join(chunks).decode('utf-8')
+    # Same newline translation as text-mode reads
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    yield content
+
+def _scan_blocks(
+    blocks: Iterable[str],
+    word_counts,
+    count_sentences: bool = False
+) -> collections.Counter:
+    """
+    Scan blocks of whole lines, counting words into word_counts.
+    
+    Line, character and blank line counts are computed per block with
+    C-level string scans; only the word counts grow with the input.
+    
+    Returns:
+        Counter of line_count, char_count and empty_lines, plus
+        sentence_count when count_sentences is set
+    """
+    totals = collections.Counter()
+    # Trailing whitespace run (and the character before it) of the text seen
+    # so far; sentence boundaries inside it depend on what comes next
+    sentence_tail = ''
+    has_text = False
+    for block in blocks:
+        # A trailing line without newline only occurs at the end of the text
+        last_line = block[block.rfind('\n') + 1:]
+        totals['line_count'] += block.count('\n') + (1 if last_line else 0)
+        totals['char_count'] += len(block)
+        totals['empty_lines'] += len(_EMPTY_LINE_RE.findall(block))
+        if last_line and not last_line.strip():
+            totals['empty_lines'] += 1
+        word_counts.update(_WORD_RE.findall(block.lower()))
+        if not count_sentences:
+            continue
+        
+        text = sentence_tail + block
+        end = len(text.rstrip())
+        if end:
+            has_text = True
+            totals['sentence_count'] += sum(1 for _ in _SENT_RE.finditer(text, 0, end))
+            sentence_tail = text[end - 1:]
+        else:
+            sentence_tail = text
+            
+    # Boundaries in the final whitespace run do not separate two sentences
+    if count_sentences:
+        totals['sentence_count'] += 1 if has_text else 0
+    return totals
+
+def _analyze_file(
+    path: str,
+    count_sentences: bool = False
+) -> Tuple[collections.Counter, collections.Counter]:
+    """Scan one file in a worker process, returning its totals and word counts"""
+    word_counts = collections.Counter()
+    totals = _scan_blocks(_iter_file_blocks(path), word_counts, count_sentences)
+    return totals, word_counts
+
+class CountMinTopK:
+    """
+    Approximate word counter using a fixed amount of memory.
+    
+    Counts are kept in a count-min sketch (never under-estimated) and only
+    the k words with the highest estimates are remembered, so memory does
+    not grow with the vocabulary.
+    """
+    
+    def __init__(self, k: int = TOP_WORDS, width: int = 1 << 16, depth: int = 4):
+        self.k = k
+        self.width = width
+        self.tables = [array('Q', bytes(8 * width)) for _ in range(depth)]
+        self.candidates: Dict[str, int] = {}
+        # Exact token totals, since the sketch cannot enumerate its words
+        self.total = 0
+        self.total_length = 0
+        
+    def update(self, words: List[str]) -> None:
+        """Count every word of the list"""
+        self.total += len(words)
+        self.total_length += sum(map(len, words))
+        width = self.width
+        candidates = self.candidates
+        for word in words:
+            estimate = None
+            for row, table in enumerate(self.tables):
+                index = hash((row, word)) % width
+                table[index] += 1
+                if estimate is None or table[index] < estimate:
+                    estimate = table[index]
+                    
+            if word in candidates or len(candidates) < self.k:
+                candidates[word] = estimate
+            else:
+                weakest = min(candidates, key=candidates.get)
+                if estimate > candidates[weakest]:
+                    del candidates[weakest]
+                    candidates[word] = estimate
+                    
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """Return the n words with the highest estimated counts"""
+        return heapq.nlargest(n, self.candidates.items(), key=itemgetter(1))
+
+def _word_totals(word_counts) -> Tuple[int, int]:
+    """Return the number of words and their summed length"""
+    if isinstance(word_counts, CountMinTopK):
+        return word_counts.total, word_counts.total_length
+    # One pass over the vocabulary rather than the token stream
+    counts = word_counts.values()
+    return sum(counts), sum(map(mul, map(len, word_counts.keys()), counts))
+
 class TextAnalyzer(ScriptBase):
     """Text file analysis script implementation"""
     
@@ -26,70 +218,138 @@ class TextAnalyzer(ScriptBase):
         manifest_path = Path(__file__).parent / "text_analyzer_manifest.json"
         super().__init__(manifest_path=str(manifest_path))
         
-    def _analyze_text(self, content: str) -> Dict[str, Any]:
+    def _analyze_text(self, content: str, count_sentences: bool = False) -> Dict[str, Any]:
         """
         Analyze text content and return statistics.
         
         Args:
             content: Text content to analyze
+            count_sentences: Also report the number of sentences
             
         Returns:
             Dict containing text statistics
         """
-        # Split into lines and words
-        lines = content.splitlines()
-        words = re.findall(r'\b\w+\b', content.lower())
+        return self._analyze_blocks([content], count_sentences=count_sentences)
         
-        # Calculate statistics
+    def _analyze_blocks(
+        self,
+        blocks: Iterable[str],
+        approximate: bool = False,
+        count_sentences: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Analyze text given as consecutive blocks of whole lines.
+        
+        Args:
+            blocks: Blocks of text; every block but the last ends with a newline
+            approximate: Estimate the most common words in fixed memory
+                instead of counting every distinct word
+            count_sentences: Also report the number of sentences
+            
+        Returns:
+            Dict containing text statistics
+        """
+        word_counts = CountMinTopK() if approximate else collections.Counter()
+        totals = _scan_blocks(blocks, word_counts, count_sentences)
+        return self._build_stats(totals, word_counts)
+        
+    def _analyze_files(self, paths: List[str], count_sentences: bool = False) -> Dict[str, Any]:
+        """
+        Analyze several files in parallel and merge their statistics.
+        
+        Each worker process returns its totals and word Counter, which are
+        merged here once per file.
+        
+        Args:
+            paths: Files to analyze
+            count_sentences: Also report the number of sentences
+            
+        Returns:
+            Dict containing the combined text statistics
+        """
+        totals = collections.Counter()
+        word_counts = collections.Counter()
+        chunksize = max(1, len(paths) // (4 * (os.cpu_count() or 1)))
+        
+        with ProcessPoolExecutor() as executor:
+            analyze = partial(_analyze_file, count_sentences=count_sentences)
+            for file_totals, file_word_counts in executor.map(analyze, paths, chunksize=chunksize):
+                totals.update(file_totals)
+                word_counts.update(file_word_counts)
+                
+        return self._build_stats(totals, word_counts)
+        
+    @staticmethod
+    def _build_stats(totals: Dict[str, int], word_counts) -> Dict[str, Any]:
+        """Build the statistics dict from scanned totals and word counts"""
+        word_count, total_word_length = _word_totals(word_counts)
         stats = {
-            "line_count": len(lines),
-            "word_count": len(words),
-            "char_count": len(content),
-            "avg_word_length": sum(len(word) for word in words) / len(words) if words else 0,
-            "empty_lines": sum(1 for line in lines if not line.strip()),
-            "most_common_words": dict(collections.Counter(words).most_common(10))
+            "line_count": totals['line_count'],
+            "word_count": word_count,
+            "char_count": totals['char_count'],
+            "avg_word_length": total_word_length / word_count if word_count else 0,
+            "empty_lines": totals['empty_lines'],
+            # Counter.most_common(n) selects with heapq.nlargest, not a full sort
+            "most_common_words": dict(word_counts.most_common(TOP_WORDS))
         }
-        
+        # Only present when sentence counting was requested
+        if 'sentence_count' in totals:
+            stats["sentence_count"] = totals['sentence_count']
         return stats
         
     def execute(self) -> bool:
         """Implement text analysis logic"""
         try:
-            input_file = Path(self.args.input_file)
+            input_glob = getattr(self.args, 'input_glob', None)
             output_format = getattr(self.args, 'output_format', 'text')
             verbose = getattr(self.args, 'verbose', False)
+            approximate = getattr(self.args, 'approximate', False)
+            count_sentences = getattr(self.args, 'sentences', False)
             
-            if verbose:
-                self.logger.info(f"Analyzing file: {input_file}")
-            
-            # Read and analyze file
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if input_glob:
+                paths = sorted(p for p in glob.glob(input_glob, recursive=True) if os.path.isfile(p))
+                if not paths:
+                    self.logger.error(f"No files match: {input_glob}")
+                    return False
+                    
+                if verbose:
+                    self.logger.info(f"Analyzing {len(paths)} files matching: {input_glob}")
+                    
+                source = input_glob
+                stats = self._analyze_files(paths, count_sentences)
+            else:
+                if not self.args.input_file:
+                    self.logger.error("Either input_file or input_glob is required")
+                    return False
+                    
+                input_file = Path(self.args.input_file)
+                if verbose:
+                    self.logger.info(f"Analyzing file: {input_file}")
                 
-            # Generate statistics
-            stats = self._analyze_text(content)
+                source = input_file.name
+                stats = self._analyze_blocks(
+                    _iter_file_blocks(str(input_file)), approximate, count_sentences
+                )
             
             # Format output
             if output_format == 'json':
                 output = stats
             else:
-                # Format as human-readable text
-                output = [
-                    "Text Analysis Results",
-                    "===================",
-                    f"File: {input_file.name}",
-                    f"Lines: {stats['line_count']} ({stats['empty_lines']} empty)",
-                    f"Words: {stats['word_count']}",
-                    f"Characters: {stats['char_count']}",
-                    f"Average Word Length: {stats['avg_word_length']:.2f}",
-                    "\nMost Common Words:",
-                    "----------------"
-                ]
-                
-                for word, count in stats['most_common_words'].items():
-                    output.append(f"{word}: {count}")
-                    
-                output = "\n".join(output)
+                # Format as human-readable text in a single buffer
+                buf = io.StringIO()
+                buf.write("Text Analysis Results\n===================\n")
+                buf.write(f"File: {source}\n")
+                buf.write(f"Lines: {stats['line_count']} ({stats['empty_lines']} empty)\n")
+                buf.write(f"Words: {stats['word_count']}\n")
+                if 'sentence_count' in stats:
+                    buf.write(f"Sentences: {stats['sentence_count']}\n")
+                buf.write(f"Characters: {stats['char_count']}\n")
+                buf.write(f"Average Word Length: {stats['avg_word_length']:.2f}\n")
+                buf.write("\nMost Common Words:\n----------------")
+                buf.writelines(
+                    f"\n{word}: {count}" for word, count in stats['most_common_words'].items()
+                )
+                output = buf.getvalue()
             
             # Generate output based on format
             self.generate_output(output, "console")
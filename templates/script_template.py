@@ -19,24 +19,65 @@ Usage:
 
 import argparse
 import asyncio
+import copy
 import json
 import logging
 import logging.handlers
 import os
 import sys
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from types import MappingProxyType
 from typing import (
-    Any, Dict, Generic, List, Optional, TypeVar, Union,
+    Any, Dict, Generic, List, Mapping, Optional, Tuple, TypeVar, Union,
     Protocol, runtime_checkable
 )
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, json de la stdlib sert de repli
+    orjson = None
+
+def _json_dumps(data: Any) -> bytes:
+    """Sérialise en JSON indenté (UTF-8), via orjson si disponible"""
+    if orjson is not None:
+        # Clés non-str acceptées et converties, comme le fait json.dumps
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _json_loads(raw: bytes) -> Any:
+    """Désérialise du JSON, via orjson si disponible"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 # Types génériques pour les données d'entrée/sortie
 InputT = TypeVar('InputT')
 OutputT = TypeVar('OutputT')
 
+# Manifests déjà chargés et validés, indexés par (chemin, mtime_ns, taille);
+# chaque instance en reçoit une copie
+_MANIFEST_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+# Type Python associé à chaque type d'input du manifest
+_TYPE_MAP: Mapping[str, type] = MappingProxyType({
+    'string': str,
+    'number': float,
+    'integer': int,
+    'boolean': bool,
+    'file': str,
+    'directory': str
+})
+
+# Parsers construits au chargement de chaque manifest, indexés comme _MANIFEST_CACHE
+_PARSER_CACHE: Dict[Tuple[str, int, int], argparse.ArgumentParser] = {}
+
+# dataclass(slots=True) n'existe qu'à partir de Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 class ScriptErrorLevel(Enum):
     """Niveaux d'erreur pour la classification"""
     FATAL = "fatal"
@@ -44,7 +85,7 @@ class ScriptErrorLevel(Enum):
     WARNING = "warning"
     INFO = "info"
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ScriptError(Exception):
     """Exception enrichie pour les erreurs de script"""
     message: str
@@ -54,7 +95,7 @@ class ScriptError(Exception):
     def __str__(self) -> str:
         return f"{self.level.value.upper()}: {self.message}"
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Progress:
     """Structure de données pour le suivi de progression"""
     current: int
@@ -67,12 +108,28 @@ class Progress:
         """Calcule le pourcentage de progression"""
         return (self.current / self.total) * 100 if self.total > 0 else 0
 
+class _LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler qui crée son répertoire au premier message écrit"""
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(exist_ok=True)
+        return super()._open()
+
 class ProgressTracker:
     """Gestionnaire de progression avec support pour les sous-étapes"""
     
+    __slots__ = ('logger', 'steps', '_last_logged_pct', '_last_logged_ts')
+    
+    # Intervalle minimal entre deux logs d'une même étape (secondes et points de %)
+    LOG_INTERVAL = 0.1
+    LOG_MIN_PERCENT = 1.0
+    
     def __init__(self, logger: logging.Logger):
         self.logger = logger
         self.steps: List[Progress] = []
+        # Dernier log par étape (indexé par id, les étapes restent dans self.steps)
+        self._last_logged_pct: Dict[int, float] = {}
+        self._last_logged_ts: Dict[int, float] = {}
         
     def add_step(self, total: int, message: str) -> Progress:
         """Ajoute une nouvelle étape au suivi"""
@@ -81,9 +138,22 @@ class ProgressTracker:
         return step
         
     def update(self, step: Progress, increment: int = 1):
-        """Met à jour la progression d'une étape"""
+        """Met à jour la progression d'une étape, en limitant la fréquence des logs"""
         step.current = min(step.current + increment, step.total)
-        self._log_progress(step)
+        
+        key = id(step)
+        pct = step.percentage
+        now = time.monotonic()
+        last_ts = self._last_logged_ts.get(key)
+        if (
+            last_ts is None
+            or (step.current == step.total and pct != self._last_logged_pct[key])
+            or (now - last_ts >= self.LOG_INTERVAL
+                and pct - self._last_logged_pct[key] >= self.LOG_MIN_PERCENT)
+        ):
+            self._last_logged_pct[key] = pct
+            self._last_logged_ts[key] = now
+            self._log_progress(step)
         
     def _log_progress(self, step: Progress):
         """Enregistre la progression dans les logs"""
@@ -136,6 +206,10 @@ class ScriptBase(Generic[InputT, OutputT], ABC):
         """Configure le logging avec rotation des fichiers"""
         self.logger = logging.getLogger(self.manifest_path.stem)
         
+        # getLogger renvoie le même logger pour un même nom : ne pas dupliquer les handlers
+        if getattr(self.logger, '_devtoolkit_configured', False):
+            return
+        
         # Handler console avec formatage
         console_handler = logging.StreamHandler()
         console_formatter = logging.Formatter(
@@ -144,13 +218,12 @@ class ScriptBase(Generic[InputT, OutputT], ABC):
         )
         console_handler.setFormatter(console_formatter)
         
-        # Handler fichier avec rotation
-        log_dir = self.script_dir / "logs"
-        log_dir.mkdir(exist_ok=True)
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_dir / f"{self.manifest_path.stem}.log",
+        # Handler fichier avec rotation, ouvert seulement au premier message
+        file_handler = _LazyRotatingFileHandler(
+            self.script_dir / "logs" / f"{self.manifest_path.stem}.log",
             maxBytes=1024 * 1024,  # 1MB
-            backupCount=5
+            backupCount=5,
+            delay=True
         )
         file_formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(pathname)s:%(lineno)d'
@@ -161,12 +234,20 @@ class ScriptBase(Generic[InputT, OutputT], ABC):
         self.logger.addHandler(console_handler)
         self.logger.addHandler(file_handler)
         self.logger.setLevel(logging.INFO)
+        self.logger._devtoolkit_configured = True
         
     def _load_manifest(self) -> Dict[str, Any]:
         """Charge et valide le manifest du script"""
         try:
-            with open(self.manifest_path, 'r', encoding='utf-8') as f:
-                manifest = json.load(f)
+            # Un manifest inchangé sur disque n'est lu et validé qu'une fois
+            st = self.manifest_path.stat()
+            key = (str(self.manifest_path), st.st_mtime_ns, st.st_size)
+            self._manifest_key = key
+            cached = _MANIFEST_CACHE.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+                
+            manifest = _json_loads(self.manifest_path.read_bytes())
                 
             # Validation des sections requises
             required_sections = ['script_info', 'execution', 'interface']
@@ -176,8 +257,12 @@ class ScriptBase(Generic[InputT, OutputT], ABC):
                     f"Sections manquantes dans le manifest: {', '.join(missing)}",
                     ScriptErrorLevel.FATAL
                 )
-                    
-            return manifest
+                
+            # Le dict en cache reste interne : l'instance travaille sur une
+            # copie ordinaire, modifiable et picklable
+            _PARSER_CACHE[key] = self._build_parser(manifest)
+            _MANIFEST_CACHE[key] = manifest
+            return copy.deepcopy(manifest)
             
         except FileNotFoundError:
             raise ScriptError(
@@ -193,34 +278,27 @@ class ScriptBase(Generic[InputT, OutputT], ABC):
             
     def _parse_arguments(self) -> argparse.Namespace:
         """Parse les arguments en ligne de commande basés sur le manifest"""
+        return _PARSER_CACHE[self._manifest_key].parse_args()
+        
+    @staticmethod
+    def _build_parser(manifest: Mapping[str, Any]) -> argparse.ArgumentParser:
+        """Construit le parser correspondant aux inputs du manifest"""
         parser = argparse.ArgumentParser(
-            description=self.manifest['script_info']['description']
+            description=manifest['script_info']['description']
         )
         
         # Ajout des arguments basés sur les inputs du manifest
-        for input_def in self.manifest['interface']['inputs']:
-            arg_name = f"--{input_def['name']}"
-            
-            # Détermine le type d'argument
-            arg_type = {
-                'string': str,
-                'number': float,
-                'integer': int,
-                'boolean': bool,
-                'file': str,
-                'directory': str
-            }.get(input_def['type'], str)
-            
+        for input_def in manifest['interface']['inputs']:
             # Configure l'argument
             parser.add_argument(
-                arg_name,
-                type=arg_type,
+                f"--{input_def['name']}",
+                type=_TYPE_MAP.get(input_def['type'], str),
                 help=input_def['description'],
                 required=input_def['required'],
                 default=input_def.get('default')
             )
             
-        return parser.parse_args()
+        return parser
         
     def validate_inputs(self) -> bool:
         """Valide tous les paramètres d'entrée"""
@@ -281,22 +359,40 @@ class ScriptBase(Generic[InputT, OutputT], ABC):
         
         Args:
             data: Données à sortir
-            output_type: Type de sortie (console, file)
+            output_type: Type de sortie (console, file). Pour "file", le
+                fichier n'est synchronisé sur disque (fsync) que si
+                l'argument durable est défini.
         """
         try:
             if output_type == "console":
                 if isinstance(data, (dict, list)):
-                    print(json.dumps(data, indent=2, ensure_ascii=False))
+                    payload = _json_dumps(data)
+                    stdout_buffer = getattr(sys.stdout, 'buffer', None)
+                    if stdout_buffer is not None:
+                        # Écrit les octets UTF-8 directement, sans ré-encodage texte
+                        sys.stdout.flush()
+                        stdout_buffer.write(payload + b'\n')
+                        stdout_buffer.flush()
+                    else:
+                        print(payload.decode('utf-8'))
                 else:
                     print(str(data))
             elif output_type == "file":
                 output_file = getattr(self.args, 'output_file', None)
                 if output_file:
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        if isinstance(data, (dict, list)):
-                            json.dump(data, f, indent=2, ensure_ascii=False)
-                        else:
-                            f.write(str(data))
+                    # Sérialisation unique puis une seule écriture
+                    if isinstance(data, (dict, list)):
+                        payload = _json_dumps(data)
+                    else:
+                        payload = str(data).encode('utf-8')
+                    # fsync uniquement sur demande explicite (--durable)
+                    if getattr(self.args, 'durable', False):
+                        with open(output_file, 'wb') as f:
+                            f.write(payload)
+                            f.flush()
+                            os.fsync(f.fileno())
+                    else:
+                        Path(output_file).write_bytes(payload)
                     self.logger.info(f"Sortie écrite dans: {output_file}")
                     
         except Exception as e:
@@ -357,9 +453,47 @@ class AsyncScriptBase(ScriptBase[InputT, OutputT], ABC):
         """
         raise NotImplementedError("Implémenter execute_async() dans votre classe")
         
+    def _run_coroutine(self, coro) -> Any:
+        """
+        Exécute une coroutine sur une boucle d'événements réutilisée.
+        
+        La boucle (asyncio.Runner à partir de Python 3.11) est créée au
+        premier appel puis conservée pour les appels suivants, jusqu'à
+        close() : run() la ferme à la fin de l'exécution.
+        """
+        runner = getattr(self, '_runner', None)
+        if runner is None:
+            if hasattr(asyncio, 'Runner'):
+                runner = asyncio.Runner()
+            else:
+                runner = asyncio.new_event_loop()
+            self._runner = runner
+            
+        if isinstance(runner, asyncio.AbstractEventLoop):
+            return runner.run_until_complete(coro)
+        return runner.run(coro)
+        
+    def close(self) -> None:
+        """Ferme la boucle d'événements du script, si elle a été créée"""
+        runner = getattr(self, '_runner', None)
+        if runner is not None:
+            self._runner = None
+            runner.close()
+            
+    def run(self) -> int:
+        """Point d'entrée principal, qui libère la boucle d'événements en sortie"""
+        try:
+            return super().run()
+        finally:
+            self.close()
+        
     def execute(self) -> bool:
         """Wrapper synchrone pour execute_async"""
-        return asyncio.run(self.execute_async())
+        return self._run_coroutine(self.execute_async())
+
+def _example_chunk(start: int, stop: int) -> int:
+    """Traite un lot d'éléments en une seule expression, sans appel de méthode par élément"""
+    return sum(i * i % 7 for i in range(start, stop))
 
 # Exemple d'implémentation
 class ExampleScript(ScriptBase[str, Dict[str, Any]], ScriptHooks):
@@ -395,10 +529,13 @@ class ExampleScript(ScriptBase[str, Dict[str, Any]], ScriptHooks):
             # Exemple de suivi de progression
             step = self.progress.add_step(100, "Traitement des données")
             
-            # Simulation de traitement
-            for i in range(100):
-                # Votre logique ici
-                self.progress.update(step)
+            # Simulation de traitement : le travail est fait par lots et la
+            # progression n'est mise à jour qu'à la fin de chaque lot
+            chunk_size = 10
+            for start in range(0, 100, chunk_size):
+                # Votre logique ici, sur le lot [start, start + chunk_size)
+                _example_chunk(start, start + chunk_size)
+                self.progress.update(step, increment=chunk_size)
             
             result = {"status": "success", "message": "Script exécuté avec succès"}
             
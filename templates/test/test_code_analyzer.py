@@ -0,0 +1,137 @@
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajout de la racine du dépôt au PYTHONPATH
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from code_analyzer import CodeAnalyzer, IgnoreRuleSet
+
+class TestIgnoreRuleSet(unittest.TestCase):
+    def assertVerdicts(self, lines, expected):
+        """Vérifie le verdict de chaque chemin pour un .gitignore donné"""
+        rule_set = IgnoreRuleSet(lines)
+        for path, verdict in expected.items():
+            with self.subTest(lines=lines, path=path):
+                self.assertIs(rule_set.match(path), verdict)
+
+    def test_anchored_patterns(self):
+        """Test des motifs ancrés et non ancrés"""
+        self.assertVerdicts(['/build', 'dist', 'docs/api'], {
+            'build': True,
+            'build/out.py': True,
+            'src/build': None,
+            'dist': True,
+            'src/dist/x.py': True,
+            'docs/api/index.py': True,
+            'src/docs/api': None,
+        })
+
+    def test_dir_only_patterns(self):
+        """Test des motifs limités aux répertoires (slash final)"""
+        self.assertVerdicts(['logs/'], {
+            'logs/': True,
+            'logs/a.py': True,
+            'src/logs/a.py': True,
+            'logs': None,
+            'src/logs': None,
+        })
+
+    def test_double_star(self):
+        """Test des motifs '**/x' et 'a/**/b'"""
+        self.assertVerdicts(['**/cache'], {
+            'cache': True,
+            'a/b/cache': True,
+            'a/cache/x.py': True,
+            'a/cached': None,
+        })
+        self.assertVerdicts(['a/**/b'], {
+            'a/b': True,
+            'a/x/b': True,
+            'a/x/y/b/z.py': True,
+            'c/a/b': None,
+            'a/bb': None,
+        })
+
+    def test_wildcards_and_classes(self):
+        """Test des jokers et des classes de caractères"""
+        self.assertVerdicts(['*.py[co]', 'file?.txt', '[!a]*.tmp'], {
+            'x.pyc': True,
+            'src/x.pyo': True,
+            'x.py': None,
+            'file1.txt': True,
+            'file10.txt': None,
+            'b.tmp': True,
+            'a.tmp': None,
+        })
+
+    def test_negation_last_match_wins(self):
+        """Test de la négation : la dernière règle correspondante l'emporte"""
+        self.assertVerdicts(['*.log', '!keep.log'], {
+            'a.log': True,
+            'keep.log': False,
+            'src/keep.log': False,
+            'a.py': None,
+        })
+        self.assertVerdicts(['!keep.log', '*.log'], {
+            'keep.log': True,
+        })
+
+    def test_fast_path_matches_regex_path(self):
+        """Test de l'accord entre recherche par ensembles et expressions régulières"""
+        lines = [
+            'build', 'logs/', '*.log', '*.py[co]', '/root.cfg',
+            'docs/api', '**/tmp', 'a/**/b', 'x?y', '[ab]*.bak',
+        ]
+        paths = [
+            'build', 'src/build', 'build/x', 'logs', 'logs/', 'a/logs/x',
+            'x.log', 'a/b.log', 'log', 'x.pyc', 'x.pyd', 'root.cfg',
+            'src/root.cfg', 'docs/api', 'docs/api/x', 'src/docs/api',
+            'tmp', 'a/tmp/x', 'a/b', 'a/c/b', 'c/a/b', 'xzy', 'xy',
+            'a.bak', 'c.bak', 'd/b1.bak', 'src/main.py',
+        ]
+        rule_set = IgnoreRuleSet(lines)
+        self.assertFalse(rule_set._ordered)
+        for path in paths:
+            with self.subTest(path=path):
+                expected = True if any(regex.match(path) for regex, _ in rule_set.rules) else None
+                self.assertIs(rule_set.match(path), expected)
+
+class TestCodeAnalyzerIgnore(unittest.TestCase):
+    def setUp(self):
+        """Arborescence temporaire avec deux niveaux de .gitignore"""
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / 'sub' / 'deep').mkdir(parents=True)
+        (root / '.gitignore').write_text('*.py\n/only_root.js\n')
+        (root / 'sub' / '.gitignore').write_text('!keep.py\n')
+        self.analyzer = CodeAnalyzer(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_deeper_gitignore_overrides(self):
+        """Test d'un .gitignore profond qui prime sur un .gitignore parent"""
+        expected = {
+            'main.py': True,
+            'keep.py': True,
+            'sub/keep.py': False,
+            'sub/deep/keep.py': False,
+            'sub/other.py': True,
+            'only_root.js': True,
+            'sub/only_root.js': False,
+        }
+        for path, ignored in expected.items():
+            with self.subTest(path=path):
+                self.assertIs(self.analyzer._should_ignore(path), ignored)
+
+    def test_common_ignored_dirs(self):
+        """Test des répertoires toujours ignorés, par composant exact"""
+        self.assertTrue(self.analyzer._should_ignore('venv/lib/x.js'))
+        self.assertTrue(self.analyzer._should_ignore('a/node_modules/x.js'))
+        self.assertFalse(self.analyzer._should_ignore('src/environment.js'))
+        self.assertFalse(self.analyzer._should_ignore('venv_notes/x.js'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+AST Cache
+---------------
+Cache des arbres syntaxiques partagé par les outils d'analyse:
+- Un fichier inchangé n'est parsé qu'une fois
+- Clé (chemin, mtime, taille) pour détecter les modifications
+- Cache disque optionnel, indexé par le hash du source, partagé entre exécutions
+"""
+
+import ast
+import hashlib
+import importlib.util
+import os
+import pickle
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Union
+
+# Répertoire du cache disque des arbres
+CACHE_DIR = Path(
+    os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+) / 'devtoolbox' / 'ast-cache'
+
+# Compteurs du cache disque pour le processus courant
+cache_stats: Dict[str, int] = {'hits': 0, 'misses': 0}
+
+# Arbre optimisé (docstrings et assert retirés avec optimize=2) : disponible
+# à partir de Python 3.13, arbre brut sur les versions antérieures
+_OPTIMIZED_AST_FLAGS = getattr(ast, 'PyCF_OPTIMIZED_AST', ast.PyCF_ONLY_AST)
+
+def _parse(source: bytes, path: str, optimize: bool) -> ast.Module:
+    """Parse un source, en arbre optimisé si demandé"""
+    if optimize:
+        return compile(source, path, 'exec', flags=_OPTIMIZED_AST_FLAGS, optimize=2)
+    # Les octets sont passés tels quels : le tokenizer applique lui-même
+    # l'encodage déclaré (PEP 263) sans décodage préalable en Python
+    return ast.parse(source, filename=path)
+
+def _cache_file(source: bytes, optimize: bool = False) -> Path:
+    """
+    Fichier de cache d'un source. La clé inclut la version de Python et le
+    magic number du bytecode : un changement d'interpréteur invalide le cache.
+    """
+    digest = hashlib.sha256(source).hexdigest()
+    version = f"{sys.version_info[0]}{sys.version_info[1]}"
+    suffix = "-opt2" if optimize else ""
+    return CACHE_DIR / f"{digest}-{version}-{importlib.util.MAGIC_NUMBER.hex()}{suffix}.pickle"
+
+def _parse_persistent(path: str, source: bytes, optimize: bool = False) -> ast.Module:
+    """Charge l'arbre depuis le cache disque, ou le parse et l'y enregistre"""
+    cache_file = _cache_file(source, optimize)
+    try:
+        tree = pickle.loads(cache_file.read_bytes())
+        cache_stats['hits'] += 1
+        return tree
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # Entrée corrompue ou illisible : reparse et réécrit
+        pass
+
+    cache_stats['misses'] += 1
+    tree = _parse(source, path, optimize)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Écriture atomique : un lecteur concurrent ne voit jamais un fichier partiel
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_bytes(pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+    return tree
+
+@lru_cache(maxsize=512)
+def _parse_cached(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    persistent: bool = False,
+    optimize: bool = False
+) -> ast.Module:
+    """Parse un fichier source; mtime_ns et size ne servent que de clé de cache"""
+    source = Path(path).read_bytes()
+    if persistent:
+        return _parse_persistent(path, source, optimize)
+    return _parse(source, path, optimize)
+
+def load_tree(
+    path: Union[str, Path],
+    persistent: bool = False,
+    optimize: bool = False
+) -> ast.Module:
+    """
+    Retourne l'arbre syntaxique d'un script, parsé au plus une fois tant
+    que le fichier n'est pas modifié.
+
+    L'arbre retourné est partagé entre les appelants et ne doit pas être
+    modifié.
+
+    Args:
+        path: Fichier source
+        persistent: Utilise aussi le cache disque (CACHE_DIR), qui survit
+            au processus et évite le parse d'un source déjà vu
+        optimize: Arbre compilé avec optimize=2, sans docstrings ni assert
+            (Python 3.13+), pour les appelants qui ne les lisent pas
+    """
+    st = os.stat(path)
+    return _parse_cached(str(path), st.st_mtime_ns, st.st_size, persistent, optimize)
@@ -10,19 +10,75 @@ Outil pour gérer les dépendances des templates avec:
 """
 
 import ast
-import importlib
+import functools
 import json
-import pkg_resources
-import subprocess
+import re
 import sys
+from collections import defaultdict
 from dataclasses import dataclass, field
+from importlib.metadata import distributions
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
-import re
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from ..script_template import ScriptBase, ScriptError, ScriptErrorLevel, _DATACLASS_SLOTS
+from .ast_cache import load_tree
+
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+    from packaging.specifiers import InvalidSpecifier, SpecifierSet
+    from packaging.version import Version
+except ImportError:  # packaging est optionnel, sans lui les versions ne sont pas comparées
+    Requirement = None
+
+# Séparateurs équivalents dans un nom de paquet (PEP 503)
+_NAME_SEPARATORS_RE = re.compile(r'[-_.]+')
 
-from ..script_template import ScriptBase, ScriptError, ScriptErrorLevel
+# Modules de la bibliothèque standard (Python 3.10+), None sinon
+_STDLIB_MODULES = frozenset(getattr(sys, 'stdlib_module_names', ())) or None
 
-@dataclass
+@functools.lru_cache(maxsize=None)
+def _canonical_name(name: str) -> str:
+    """Normalise un nom de paquet selon la PEP 503"""
+    return _NAME_SEPARATORS_RE.sub('-', name).lower()
+
+@functools.lru_cache(maxsize=1024)
+def _requirement(spec: str) -> 'Requirement':
+    """Parse une exigence PEP 508; les chaînes répétées ne sont parsées qu'une fois"""
+    return Requirement(spec)
+
+@functools.lru_cache(maxsize=None)
+def _is_stdlib_name(name: str) -> bool:
+    """Vérifie si un nom de module de premier niveau appartient à la stdlib"""
+    if _STDLIB_MODULES is not None:
+        return name in _STDLIB_MODULES
+    if name in sys.builtin_module_names:
+        return True
+    # Repli pour Python < 3.10 : localise le module sur disque
+    import importlib.util
+    try:
+        module_path = importlib.util.find_spec(name)
+        if module_path is None or not module_path.origin:
+            return False
+        origin = Path(module_path.origin).resolve()
+        site_dirs = _site_dirs()
+        return not any(parent in site_dirs for parent in origin.parents)
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=None)
+def _site_dirs() -> FrozenSet[Path]:
+    """Répertoires d'installation des paquets tiers (site-packages, dist-packages...)"""
+    import site
+    import sysconfig
+    
+    paths = {sysconfig.get_paths()['purelib'], sysconfig.get_paths()['platlib']}
+    if hasattr(site, 'getsitepackages'):
+        paths.update(site.getsitepackages())
+    if site.ENABLE_USER_SITE:
+        paths.add(site.getusersitepackages())
+    return frozenset(Path(p).resolve() for p in paths)
+
+@dataclass(**_DATACLASS_SLOTS)
 class Dependency:
     """Information sur une dépendance"""
     name: str
@@ -31,7 +87,7 @@ class Dependency:
     is_compatible: bool = True
     conflicts: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DependencyCheck:
     """Résultat de vérification des dépendances"""
     dependencies: List[Dependency]
@@ -75,10 +131,19 @@ class DependencyAnalyzer:
     """Analyseur de dépendances"""
     
     def __init__(self):
-        self.installed_packages = {
-            dist.project_name: dist.version
-            for dist in pkg_resources.working_set
-        }
+        self.installed_packages: Dict[str, str] = {}
+        # Distributions installées, pour lire leurs exigences déclarées
+        self._distributions: Dict[str, Any] = {}
+        for dist in distributions():
+            name = dist.metadata['Name']
+            if not name:
+                continue
+            # Noms normalisés (PEP 503) et internés, clés de toutes les recherches
+            name = sys.intern(_canonical_name(name))
+            # Comme pour sys.path, la première distribution trouvée l'emporte
+            if name not in self._distributions:
+                self._distributions[name] = dist
+                self.installed_packages[name] = dist.version
     
     def check_manifest(self, manifest_path: Path) -> DependencyCheck:
         """Vérifie les dépendances d'un manifest"""
@@ -96,20 +161,17 @@ class DependencyAnalyzer:
                 version_spec = '*'  # Par défaut
                 
                 # Vérifie si installé
-                if dep_name not in self.installed_packages:
+                installed_version = self.installed_packages.get(_canonical_name(dep_name))
+                if installed_version is None:
                     missing.append(dep_name)
                     dependencies.append(Dependency(dep_name, version_spec))
                     continue
                 
-                installed_version = self.installed_packages[dep_name]
-                
                 # Vérifie la compatibilité de version
                 try:
-                    if version_spec != '*':
-                        spec = pkg_resources.Requirement.parse(
-                            f"{dep_name}{version_spec}"
-                        )
-                        if installed_version not in spec:
+                    if version_spec != '*' and Requirement is not None:
+                        spec = _requirement(f"{dep_name}{version_spec}").specifier
+                        if not spec.contains(installed_version, prereleases=True):
                             outdated.append(
                                 (dep_name, installed_version, version_spec)
                             )
@@ -149,11 +211,22 @@ class DependencyAnalyzer:
                 ScriptErrorLevel.ERROR
             )
     
-    def check_script(self, script_path: Path) -> DependencyCheck:
-        """Analyse les dépendances d'un script"""
+    def check_script(
+        self,
+        script_path: Path,
+        tree: Optional[ast.AST] = None
+    ) -> DependencyCheck:
+        """
+        Analyse les dépendances d'un script.
+        
+        Args:
+            script_path: Script à analyser
+            tree: Arbre déjà parsé du script, partagé avec d'autres
+                analyseurs (par défaut chargé via load_tree)
+        """
         try:
-            with open(script_path, 'r', encoding='utf-8') as f:
-                tree = ast.parse(f.read())
+            if tree is None:
+                tree = load_tree(script_path)
             
             dependencies = []
             missing = []
@@ -164,7 +237,7 @@ class DependencyAnalyzer:
             for node in ast.walk(tree):
                 if isinstance(node, ast.Import):
                     for name in node.names:
-                        dep_name = name.name.split('.')[0]
+                        dep_name = sys.intern(name.name.split('.')[0])
                         if not self._is_stdlib_module(dep_name):
                             self._check_dependency(
                                 dep_name,
@@ -174,7 +247,7 @@ class DependencyAnalyzer:
                             
                 elif isinstance(node, ast.ImportFrom):
                     if node.module:
-                        dep_name = node.module.split('.')[0]
+                        dep_name = sys.intern(node.module.split('.')[0])
                         if not self._is_stdlib_module(dep_name):
                             self._check_dependency(
                                 dep_name,
@@ -200,13 +273,7 @@ class DependencyAnalyzer:
     
     def _is_stdlib_module(self, name: str) -> bool:
         """Vérifie si un module est dans la bibliothèque standard"""
-        try:
-            module_path = importlib.util.find_spec(name)
-            if module_path is None:
-                return False
-            return 'site-packages' not in str(module_path.origin)
-        except Exception:
-            return False
+        return _is_stdlib_name(name)
     
     def _check_dependency(
         self,
@@ -215,7 +282,8 @@ class DependencyAnalyzer:
         missing: List[str]
     ):
         """Vérifie une dépendance individuelle"""
-        if name not in self.installed_packages:
+        installed_version = self.installed_packages.get(_canonical_name(name))
+        if installed_version is None:
             missing.append(name)
             dependencies.append(Dependency(name, '*'))
         else:
@@ -223,7 +291,7 @@ class DependencyAnalyzer:
                 Dependency(
                     name,
                     '*',
-                    self.installed_packages[name],
+                    installed_version,
                     True
                 )
             )
@@ -233,24 +301,49 @@ class DependencyAnalyzer:
         dependencies: List[Dependency],
         conflicts: List[Tuple[str, str, str]]
     ):
-        """Vérifie les conflits entre dépendances"""
-        for i, dep1 in enumerate(dependencies):
-            for dep2 in dependencies[i+1:]:
-                if dep1.name == dep2.name:
+        """
+        Vérifie les conflits entre dépendances.
+        
+        Les exigences déclarées par chaque paquet installé sont confrontées
+        aux versions installées des autres dépendances, en une seule passe
+        sur les métadonnées, sans lancer pip.
+        """
+        if Requirement is None:
+            return
+            
+        # Une même dépendance déclarée plusieurs fois : regroupement par nom
+        buckets: Dict[str, List[Dependency]] = defaultdict(list)
+        for dep in dependencies:
+            if dep.version_spec != '*':
+                buckets[_canonical_name(dep.name)].append(dep)
+        for group in buckets.values():
+            if len(group) > 1:
+                self._check_same_name(group, conflicts)
+            
+        installed = {
+            _canonical_name(dep.name): dep
+            for dep in dependencies
+            if dep.installed_version
+        }
+        
+        for key, dep1 in installed.items():
+            dist = self._distributions.get(key)
+            if dist is None:
+                continue
+                
+            for line in dist.requires or ():
+                try:
+                    requirement = _requirement(line)
+                except InvalidRequirement:
+                    continue
+                # Ignore les exigences d'extras et celles d'autres plateformes
+                if requirement.marker and not requirement.marker.evaluate({'extra': ''}):
                     continue
                     
-                try:
-                    # Vérifie si les deux packages peuvent être installés ensemble
-                    subprocess.run(
-                        [
-                            'pip', 'check',
-                            f"{dep1.name}=={dep1.installed_version}",
-                            f"{dep2.name}=={dep2.installed_version}"
-                        ],
-                        check=True,
-                        capture_output=True
-                    )
-                except subprocess.CalledProcessError:
+                dep2 = installed.get(_canonical_name(requirement.name))
+                if dep2 is None or dep2 is dep1:
+                    continue
+                if not requirement.specifier.contains(dep2.installed_version, prereleases=True):
                     conflicts.append(
                         (
                             f"{dep1.name}=={dep1.installed_version}",
@@ -261,6 +354,64 @@ class DependencyAnalyzer:
                     dep1.conflicts.append(dep2.name)
                     dep2.conflicts.append(dep1.name)
 
+    def _check_same_name(
+        self,
+        group: List[Dependency],
+        conflicts: List[Tuple[str, str, str]]
+    ):
+        """
+        Vérifie qu'une dépendance déclarée plusieurs fois avec des
+        contraintes de version peut les satisfaire toutes à la fois.
+        
+        Les contraintes sont incompatibles si une version épinglée (==) est
+        exclue par une autre, ou si la borne inférieure dépasse la borne
+        supérieure.
+        """
+        try:
+            specs = [SpecifierSet(dep.version_spec) for dep in group]
+        except InvalidSpecifier:
+            return
+        combined = SpecifierSet()
+        for spec in specs:
+            combined &= spec
+            
+        incompatible = False
+        lower = upper = None
+        for spec in combined:
+            if spec.operator in ('==', '===') and not spec.version.endswith('.*'):
+                if not combined.contains(spec.version, prereleases=True):
+                    incompatible = True
+                    break
+            elif spec.operator in ('>=', '>'):
+                version = Version(spec.version)
+                if lower is None or version > lower[0]:
+                    lower = (version, spec.operator == '>')
+            elif spec.operator in ('<=', '<'):
+                version = Version(spec.version)
+                if upper is None or version < upper[0]:
+                    upper = (version, spec.operator == '<')
+                    
+        if lower and upper and (
+            lower[0] > upper[0] or
+            (lower[0] == upper[0] and (lower[1] or upper[1]))
+        ):
+            incompatible = True
+            
+        if not incompatible:
+            return
+            
+        first = group[0]
+        for other in group[1:]:
+            conflicts.append(
+                (
+                    first.name,
+                    f"{first.name}{first.version_spec}",
+                    f"{other.name}{other.version_spec}"
+                )
+            )
+            first.conflicts.append(other.name)
+            other.conflicts.append(first.name)
+
 class DependencyChecker(ScriptBase[Path, Dict[str, Any]]):
     """Vérificateur de dépendances pour les scripts"""
     
@@ -309,12 +460,12 @@ class DependencyChecker(ScriptBase[Path, Dict[str, Any]]):
             # Génère requirements.txt si demandé
             if getattr(self.args, 'generate_requirements', False):
                 requirements_path = path.parent / 'requirements.txt'
-                with open(requirements_path, 'w', encoding='utf-8') as f:
-                    for dep in result.dependencies:
-                        if dep.installed_version:
-                            f.write(f"{dep.name}=={dep.installed_version}\n")
-                        else:
-                            f.write(f"{dep.name}\n")
+                lines = [
+                    f"{dep.name}=={dep.installed_version}\n" if dep.installed_version
+                    else f"{dep.name}\n"
+                    for dep in result.dependencies
+                ]
+                requirements_path.write_text(''.join(lines), encoding='utf-8')
                 self.logger.info(
                     f"requirements.txt généré: {requirements_path}"
                 )
@@ -10,16 +10,24 @@ Outil pour générer automatiquement les manifests de script avec:
 """
 
 import ast
-import importlib
-import inspect
-import pkgutil
+import glob
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Type
-import json
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type, Union
 
-from ..script_template import ScriptBase, ScriptError, ScriptErrorLevel
+from ..script_template import ScriptBase, ScriptError, ScriptErrorLevel, _json_dumps
+from .ast_cache import load_tree
+
+# Balises de métadonnées reconnues dans la docstring du module
+_META_PREFIXES = ('@author:', '@version:', '@category:', '@tags:')
+_META_RE = re.compile(r'@(author|version|category|tags):\s*(.*)')
+
+# Classes de base identifiant une classe de script
+_SCRIPT_BASE_NAMES = frozenset({'ScriptBase'})
 
 @dataclass
 class ScriptInfo:
@@ -38,25 +46,32 @@ class ScriptInfo:
 class ScriptAnalyzer:
     """Analyseur de scripts Python"""
     
-    def __init__(self, script_path: Path):
+    def __init__(self, script_path: Path, tree: Optional[ast.AST] = None):
+        """
+        Args:
+            script_path: Script à analyser
+            tree: Arbre déjà parsé du script (par exemple via load_tree),
+                partagé avec d'autres analyseurs pour éviter un second parse
+        """
         self.script_path = script_path
-        self.tree: Optional[ast.AST] = None
+        self.tree: Optional[ast.AST] = tree
         self.info = ScriptInfo(
             name=script_path.stem,
             description=""
         )
+        # Noms des arguments déjà ajoutés à info.inputs
+        self._input_names: Set[str] = set()
         
     def analyze(self) -> ScriptInfo:
         """Analyse complète du script"""
         try:
-            # Parse le fichier
-            with open(self.script_path, 'r', encoding='utf-8') as f:
-                self.tree = ast.parse(f.read())
+            # Parse le fichier (arbre en cache tant qu'il n'est pas modifié)
+            if self.tree is None:
+                self.tree = load_tree(self.script_path)
             
             # Extraction des informations
             self._extract_docstring()
-            self._extract_imports()
-            self._extract_class_info()
+            self._collect_node_info()
             
             return self.info
             
@@ -66,14 +81,37 @@ class ScriptAnalyzer:
                 ScriptErrorLevel.ERROR
             )
     
+    @staticmethod
+    def analyze_many(
+        script_paths: List[Path],
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[Path, Union[ScriptInfo, Exception]]]:
+        """
+        Analyse plusieurs scripts en parallèle, un processus par cœur.
+        
+        Args:
+            script_paths: Scripts à analyser
+            max_workers: Nombre de processus (par défaut os.cpu_count())
+            
+        Yields:
+            (chemin, ScriptInfo) au fil des analyses terminées, ou
+            (chemin, exception) si l'analyse d'un script a échoué
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_analyze_script, path): path
+                for path in script_paths
+            }
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+    
     def _extract_docstring(self):
         """Extrait les informations de la docstring"""
-        if (
-            isinstance(self.tree.body[0], ast.Expr) and
-            isinstance(self.tree.body[0].value, ast.Str)
-        ):
-            docstring = self.tree.body[0].value.s
-            
+        docstring = ast.get_docstring(self.tree)
+        if docstring:
             # Parse la docstring
             lines = docstring.split('\n')
             if lines:
@@ -88,45 +126,24 @@ class ScriptAnalyzer:
                 # Recherche des métadonnées
                 for line in lines:
                     line = line.strip()
-                    if line.startswith('@author:'):
-                        self.info.author = line.split(':', 1)[1].strip()
-                    elif line.startswith('@version:'):
-                        self.info.version = line.split(':', 1)[1].strip()
-                    elif line.startswith('@category:'):
-                        self.info.category = line.split(':', 1)[1].strip()
-                    elif line.startswith('@tags:'):
-                        tags = line.split(':', 1)[1].strip()
-                        self.info.tags = [t.strip() for t in tags.split(',')]
-    
-    def _extract_imports(self):
-        """Extrait les dépendances des imports"""
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    if not name.name.startswith('.'):
-                        self.info.dependencies.add(name.name.split('.')[0])
-            elif isinstance(node, ast.ImportFrom):
-                if node.module and not node.module.startswith('.'):
-                    self.info.dependencies.add(node.module.split('.')[0])
-    
-    def _extract_class_info(self):
-        """Extrait les informations des classes"""
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.ClassDef):
-                # Vérifie si c'est une sous-classe de ScriptBase
-                if any(
-                    isinstance(base, ast.Name) and
-                    base.id == 'ScriptBase'
-                    for base in node.bases
-                ):
-                    self._analyze_script_class(node)
+                    if not line.startswith(_META_PREFIXES):
+                        continue
+                    tag, value = _META_RE.match(line).groups()
+                    if tag == 'tags':
+                        self.info.tags = [t.strip() for t in value.split(',')]
+                    else:
+                        setattr(self.info, tag, value)
     
     def _analyze_script_class(self, node: ast.ClassDef):
         """Analyse une classe de script"""
-        for subnode in ast.walk(node):
-            if isinstance(subnode, ast.FunctionDef):
-                if subnode.name == 'execute':
-                    self._extract_io_info(subnode)
+        # execute est une méthode : seul le corps direct de la classe est examiné
+        for subnode in node.body:
+            if isinstance(subnode, ast.FunctionDef) and subnode.name == 'execute':
+                self._extract_io_info(subnode)
+    
+    def _collect_node_info(self):
+        """Extrait les dépendances et les informations des classes en un seul parcours"""
+        _ScriptVisitor(self).visit(self.tree)
     
     def _extract_io_info(self, node: ast.FunctionDef):
         """Extrait les informations d'entrée/sortie"""
@@ -139,13 +156,17 @@ class ScriptAnalyzer:
                     "description": "Résultat de l'exécution"
                 })
         
-        # Analyse les accès aux arguments
-        for subnode in ast.walk(node):
+        # Analyse les accès aux arguments dans le corps de la méthode
+        for subnode in (n for stmt in node.body for n in ast.walk(stmt)):
             if (
                 isinstance(subnode, ast.Attribute) and
                 isinstance(subnode.value, ast.Name) and
                 subnode.value.id == 'args'
             ):
+                # Un argument lu plusieurs fois ne donne qu'une entrée
+                if subnode.attr in self._input_names:
+                    continue
+                self._input_names.add(subnode.attr)
                 self.info.inputs.append({
                     "name": subnode.attr,
                     "type": "string",  # Type par défaut
@@ -153,15 +174,110 @@ class ScriptAnalyzer:
                     "required": True
                 })
 
+def _analyze_script(script_path: Path) -> ScriptInfo:
+    """Analyse un script dans un processus de travail"""
+    return ScriptAnalyzer(script_path).analyze()
+
+class _ScriptVisitor(ast.NodeVisitor):
+    """
+    Parcourt l'arbre une seule fois pour collecter les imports et
+    analyser les sous-classes de ScriptBase.
+    """
+    
+    def __init__(self, analyzer: ScriptAnalyzer):
+        self.analyzer = analyzer
+        
+    def visit_Import(self, node: ast.Import):
+        for name in node.names:
+            if not name.name.startswith('.'):
+                self.analyzer.info.dependencies.add(sys.intern(name.name.split('.')[0]))
+                
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module and not node.module.startswith('.'):
+            self.analyzer.info.dependencies.add(sys.intern(node.module.split('.')[0]))
+            
+    def visit_ClassDef(self, node: ast.ClassDef):
+        # Vérifie si c'est une sous-classe de ScriptBase
+        for base in node.bases:
+            if isinstance(base, ast.Name) and base.id in _SCRIPT_BASE_NAMES:
+                self.analyzer._analyze_script_class(node)
+                break
+        # Les classes imbriquées peuvent aussi être des scripts
+        self.generic_visit(node)
+
 class ManifestGenerator(ScriptBase[Path, Dict[str, Any]]):
     """Générateur de manifests pour les scripts"""
     
+    @staticmethod
+    def _build_manifest(info: ScriptInfo, script_path: Path) -> Dict[str, Any]:
+        """Construit le manifest à partir des informations du script"""
+        return {
+            "script_info": {
+                "id": f"{info.category}-{info.name}",
+                "name": info.name,
+                "version": info.version,
+                "description": info.description,
+                "author": info.author,
+                "category": info.category,
+                "tags": info.tags
+            },
+            "execution": {
+                "python_version": info.python_version,
+                "dependencies": sorted(info.dependencies),
+                "entry_point": script_path.name,
+                "environment_vars": []
+            },
+            "interface": {
+                "inputs": info.inputs,
+                "outputs": info.outputs
+            }
+        }
+        
+    @staticmethod
+    def _manifest_path_for(script_path: Path) -> Path:
+        """Chemin du manifest écrit à côté d'un script en mode multiple"""
+        return script_path.with_name(f"{script_path.stem}_manifest.json")
+        
+    @staticmethod
+    def _write_manifest(manifest: Dict[str, Any], output_path: Path):
+        """Écrit le manifest sur disque en une seule écriture"""
+        output_path.write_bytes(_json_dumps(manifest))
+            
+    def _is_up_to_date(self, script_path: Path, output_path: Path) -> bool:
+        """Vérifie si le manifest est plus récent que le script (sauf --force)"""
+        if getattr(self.args, 'force', False):
+            return False
+        try:
+            return output_path.stat().st_mtime_ns >= script_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+            
+    @staticmethod
+    def _info_report(info: ScriptInfo) -> Dict[str, Any]:
+        """Résumé des informations d'un script pour le rapport"""
+        return {
+            "name": info.name,
+            "version": info.version,
+            "dependencies": len(info.dependencies),
+            "inputs": len(info.inputs),
+            "outputs": len(info.outputs)
+        }
+    
     def execute(self) -> bool:
         """Génère le manifest pour un script"""
         try:
+            # Plusieurs scripts désignés par des motifs glob
+            patterns = getattr(self.args, 'paths', None)
+            if patterns:
+                return self._execute_many(patterns)
+                
             script_path = Path(self.args.script_path)
             output_path = Path(self.args.output_path)
             
+            if self._is_up_to_date(script_path, output_path):
+                self.logger.info(f"Manifest à jour: {output_path}")
+                return True
+                
             # Crée une étape de progression
             step = self.progress.add_step(3, "Génération du manifest")
             
@@ -172,33 +288,12 @@ class ManifestGenerator(ScriptBase[Path, Dict[str, Any]]):
             self.progress.update(step)
             
             # Génère le manifest
-            manifest = {
-                "script_info": {
-                    "id": f"{info.category}-{info.name}",
-                    "name": info.name,
-                    "version": info.version,
-                    "description": info.description,
-                    "author": info.author,
-                    "category": info.category,
-                    "tags": info.tags
-                },
-                "execution": {
-                    "python_version": info.python_version,
-                    "dependencies": sorted(info.dependencies),
-                    "entry_point": script_path.name,
-                    "environment_vars": []
-                },
-                "interface": {
-                    "inputs": info.inputs,
-                    "outputs": info.outputs
-                }
-            }
+            manifest = self._build_manifest(info, script_path)
             
             self.progress.update(step)
             
             # Écrit le manifest
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            self._write_manifest(manifest, output_path)
                 
             self.logger.info(f"Manifest généré: {output_path}")
             self.progress.update(step)
@@ -207,13 +302,7 @@ class ManifestGenerator(ScriptBase[Path, Dict[str, Any]]):
             report = {
                 "script": str(script_path),
                 "manifest": str(output_path),
-                "info": {
-                    "name": info.name,
-                    "version": info.version,
-                    "dependencies": len(info.dependencies),
-                    "inputs": len(info.inputs),
-                    "outputs": len(info.outputs)
-                }
+                "info": self._info_report(info)
             }
             
             self.generate_output(report)
@@ -223,6 +312,59 @@ class ManifestGenerator(ScriptBase[Path, Dict[str, Any]]):
         except Exception as e:
             self.logger.error(f"Erreur de génération: {str(e)}")
             return False
+            
+    def _execute_many(self, patterns: Union[str, List[str]]) -> bool:
+        """
+        Génère les manifests de tous les scripts correspondant aux motifs.
+        
+        Les scripts sont analysés en parallèle; chaque manifest est écrit à
+        côté de son script sous le nom <script>_manifest.json.
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        script_paths = sorted({
+            Path(p)
+            for pattern in patterns
+            for p in glob.glob(pattern, recursive=True)
+            if p.endswith('.py') and os.path.isfile(p)
+        })
+        if not script_paths:
+            self.logger.error(f"Aucun script ne correspond à: {', '.join(patterns)}")
+            return False
+            
+        # Seuls les scripts modifiés depuis leur manifest sont réanalysés
+        script_paths = [
+            path for path in script_paths
+            if not self._is_up_to_date(path, self._manifest_path_for(path))
+        ]
+        if not script_paths:
+            self.logger.info("Manifests à jour")
+            self.generate_output([])
+            return True
+            
+        step = self.progress.add_step(len(script_paths), "Génération des manifests")
+        self.logger.info(f"Analyse de {len(script_paths)} scripts")
+        
+        reports = []
+        success = True
+        for script_path, info in ScriptAnalyzer.analyze_many(script_paths):
+            if isinstance(info, Exception):
+                self.logger.error(f"Erreur d'analyse de {script_path}: {str(info)}")
+                success = False
+            else:
+                output_path = self._manifest_path_for(script_path)
+                self._write_manifest(self._build_manifest(info, script_path), output_path)
+                reports.append({
+                    "script": str(script_path),
+                    "manifest": str(output_path),
+                    "info": self._info_report(info)
+                })
+            self.progress.update(step)
+            
+        # Ordre stable quel que soit l'ordre de fin des analyses
+        reports.sort(key=lambda report: report["script"])
+        self.generate_output(reports)
+        return success
 
 def main():
     """Point d'entrée du script"""
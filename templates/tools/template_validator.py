@@ -16,15 +16,17 @@ import sys
 import traceback
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Type, get_type_hints
+from typing import Any, Dict, List, Optional, Set, Type
 import json
 
 from ..script_template import (
     ScriptBase, ScriptError, ScriptErrorLevel,
-    ScriptHooks
+    ScriptHooks, _DATACLASS_SLOTS
 )
+from . import ast_cache
+from .ast_cache import load_tree
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ValidationResult:
     """Résultat de validation d'un script"""
     script_path: Path
@@ -55,25 +57,42 @@ class ValidationResult:
 class ScriptValidator:
     """Validateur de scripts"""
     
-    def __init__(self, script_path: Path):
+    def __init__(self, script_path: Path, static_only: bool = False):
+        """
+        Args:
+            script_path: Script à valider
+            static_only: Valide uniquement depuis l'arbre syntaxique, sans
+                exécuter le module (les hooks ne sont alors pas testés)
+        """
         self.script_path = script_path
+        self.static_only = static_only
         self.result = ValidationResult(script_path, True)
         self.tree: Optional[ast.AST] = None
         self.module: Optional[Any] = None
         self.script_class: Optional[Type] = None
+        # Faits extraits de l'arbre (imports, classes) par _CollectVisitor
+        self._facts: Dict[str, Any] = {}
+        # Méthodes de la classe de script, énumérées une seule fois
+        self._methods: Dict[str, Any] = {}
         
     def validate(self) -> ValidationResult:
         """Validation complète du script"""
         try:
-            # Charge le module
-            self._load_module()
+            # Parse le code source et collecte ses faits en un seul parcours
+            self.tree = self._load_and_parse()
+            collector = _CollectVisitor()
+            collector.visit(self.tree)
+            self._facts = collector.facts
+            
+            self._validate_imports()
+            if self.static_only:
+                self._validate_static()
+                return self.result
             
-            # Parse le code source
-            with open(self.script_path, 'r', encoding='utf-8') as f:
-                self.tree = ast.parse(f.read())
+            # Charge le module, nécessaire au test des hooks
+            self._load_module()
             
             # Exécute les validations
-            self._validate_imports()
             self._validate_class_structure()
             self._validate_types()
             self._validate_documentation()
@@ -85,6 +104,20 @@ class ScriptValidator:
             self.result.add_error(f"Erreur de validation: {str(e)}")
             return self.result
     
+    def _load_and_parse(self) -> ast.AST:
+        """
+        Parse le script, via le cache disque des arbres si le source est connu.
+        
+        Hors analyse statique, l'arbre ne sert qu'aux imports et aux classes :
+        il est optimisé (sans docstrings), la documentation étant lue sur la
+        classe chargée.
+        """
+        return load_tree(
+            self.script_path,
+            persistent=True,
+            optimize=not self.static_only
+        )
+    
     def _load_module(self):
         """Charge le module Python"""
         try:
@@ -104,6 +137,9 @@ class ScriptValidator:
                     obj != ScriptBase
                 ):
                     self.script_class = obj
+                    self._methods = dict(
+                        inspect.getmembers(obj, inspect.isfunction)
+                    )
                     break
             
             if not self.script_class:
@@ -117,15 +153,7 @@ class ScriptValidator:
     def _validate_imports(self):
         """Valide les imports"""
         required_imports = {'typing', 'pathlib', 'logging'}
-        found_imports = set()
-        
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    found_imports.add(name.name.split('.')[0])
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    found_imports.add(node.module.split('.')[0])
+        found_imports = self._facts['imports']
         
         missing = required_imports - found_imports
         if missing:
@@ -140,9 +168,7 @@ class ScriptValidator:
             
         # Vérifie les méthodes requises
         required_methods = {'execute', 'run'}
-        class_methods = set(
-            name for name, _ in inspect.getmembers(self.script_class, inspect.isfunction)
-        )
+        class_methods = self._methods.keys()
         
         missing = required_methods - class_methods
         if missing:
@@ -164,23 +190,25 @@ class ScriptValidator:
         if not self.script_class:
             return
             
-        # Vérifie les annotations de la classe
-        try:
-            type_hints = get_type_hints(self.script_class)
-            
-            # Vérifie execute()
-            if 'execute' in type_hints:
-                if type_hints['execute'] != bool:
-                    self.result.add_error(
-                        "execute() doit retourner bool"
-                    )
-            else:
-                self.result.add_warning(
-                    "execute() manque d'annotation de type de retour"
-                )
+        execute = self._methods.get('execute')
+        if execute is None:
+            return
             
-        except Exception as e:
-            self.result.add_warning(f"Erreur validation types: {str(e)}")
+        # Lecture directe de l'annotation de retour, sans get_type_hints :
+        # ni évaluation des références avant, ni parcours du MRO. Une
+        # annotation -> None vaut None : seule l'absence de clé est un oubli
+        annotations = execute.__annotations__
+        if 'return' not in annotations:
+            self.result.add_warning(
+                "execute() manque d'annotation de type de retour"
+            )
+            return
+        return_type = annotations['return']
+        # Annotation restée chaîne avec from __future__ import annotations
+        if return_type is not bool and return_type != 'bool':
+            self.result.add_error(
+                "execute() doit retourner bool"
+            )
     
     def _validate_documentation(self):
         """Valide la documentation"""
@@ -192,15 +220,54 @@ class ScriptValidator:
             self.result.add_warning("Documentation de classe manquante")
         
         # Vérifie les docstrings des méthodes
-        for name, method in inspect.getmembers(
-            self.script_class,
-            inspect.isfunction
-        ):
+        for name, method in self._methods.items():
             if not name.startswith('_') and not method.__doc__:
                 self.result.add_warning(
                     f"Documentation manquante pour {name}()"
                 )
     
+    def _validate_static(self):
+        """Valide la classe de script depuis l'arbre, sans exécuter le module"""
+        node = next(
+            (
+                cls for cls in self._facts['classes'].values()
+                if 'ScriptBase' in map(_base_name, cls.bases)
+            ),
+            None
+        )
+        if node is None:
+            self.result.add_error(
+                "Aucune classe héritant de ScriptBase trouvée"
+            )
+            return
+        
+        # Seules les méthodes définies dans la classe sont visibles : run()
+        # est héritée de ScriptBase, execute() doit être implémentée
+        methods = {
+            subnode.name: subnode
+            for subnode in node.body
+            if isinstance(subnode, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+        execute = methods.get('execute')
+        if execute is None:
+            self.result.add_error("Méthodes requises manquantes: execute")
+        elif execute.returns is None:
+            self.result.add_warning(
+                "execute() manque d'annotation de type de retour"
+            )
+        elif _annotation_name(execute.returns) != 'bool':
+            self.result.add_error(
+                "execute() doit retourner bool"
+            )
+        
+        if not ast.get_docstring(node):
+            self.result.add_warning("Documentation de classe manquante")
+        for name, method in methods.items():
+            if not name.startswith('_') and not ast.get_docstring(method):
+                self.result.add_warning(
+                    f"Documentation manquante pour {name}()"
+                )
+    
     def _validate_hooks(self):
         """Valide l'implémentation des hooks"""
         if not self.script_class:
@@ -218,12 +285,12 @@ class ScriptValidator:
                 'post_execute'
             }
             
-            implemented = set(
-                name for name, _ in inspect.getmembers(
-                    self.script_class,
-                    inspect.isfunction
-                )
-            )
+            # Les définitions vides héritées du Protocol ne comptent pas
+            implemented = {
+                name for name in hook_methods
+                if name in self._methods
+                and self._methods[name] is not vars(ScriptHooks).get(name)
+            }
             
             missing = hook_methods - implemented
             if missing:
@@ -231,12 +298,17 @@ class ScriptValidator:
                     f"Hooks non implémentés: {', '.join(missing)}"
                 )
             
+            # Sans pre_validate ni pre_execute propres, rien à tester :
+            # la classe n'est pas instanciée
+            if not implemented & {'pre_validate', 'pre_execute'}:
+                return
+            
             # Test des hooks
             try:
                 instance = self.script_class()
                 
                 # Test pre_validate
-                if hasattr(instance, 'pre_validate'):
+                if 'pre_validate' in implemented:
                     result = instance.pre_validate()
                     if not isinstance(result, bool):
                         self.result.add_error(
@@ -244,7 +316,7 @@ class ScriptValidator:
                         )
                 
                 # Test pre_execute
-                if hasattr(instance, 'pre_execute'):
+                if 'pre_execute' in implemented:
                     result = instance.pre_execute()
                     if not isinstance(result, bool):
                         self.result.add_error(
@@ -254,6 +326,43 @@ class ScriptValidator:
             except Exception as e:
                 self.result.add_error(f"Erreur test hooks: {str(e)}")
 
+def _base_name(node: ast.expr) -> Optional[str]:
+    """Nom d'une classe de base : Name, module.Name ou Name[...]"""
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+def _annotation_name(node: ast.expr) -> Optional[str]:
+    """Nom d'une annotation simple, y compris sous forme de chaîne"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return _base_name(node)
+
+class _CollectVisitor(ast.NodeVisitor):
+    """Collecte en un seul parcours les imports et les classes d'un module"""
+    
+    def __init__(self):
+        self.facts: Dict[str, Any] = {
+            'imports': set(),
+            'classes': {}
+        }
+        
+    def visit_Import(self, node: ast.Import):
+        for name in node.names:
+            self.facts['imports'].add(name.name.split('.')[0])
+            
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module:
+            self.facts['imports'].add(node.module.split('.')[0])
+            
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.facts['classes'][node.name] = node
+        self.generic_visit(node)
+
 class TemplateValidator(ScriptBase[Path, Dict[str, Any]]):
     """Validateur de templates de script"""
     
@@ -267,7 +376,10 @@ class TemplateValidator(ScriptBase[Path, Dict[str, Any]]):
             
             # Valide le script
             self.logger.info(f"Validation du script: {script_path}")
-            validator = ScriptValidator(script_path)
+            validator = ScriptValidator(
+                script_path,
+                static_only=getattr(self.args, 'static_only', False)
+            )
             result = validator.validate()
             
             # Mise à jour progression
@@ -287,6 +399,11 @@ class TemplateValidator(ScriptBase[Path, Dict[str, Any]]):
             if result.is_valid:
                 self.logger.info("Script valide!")
             
+            self.logger.info(
+                f"Cache AST: {ast_cache.cache_stats['hits']} succès, "
+                f"{ast_cache.cache_stats['misses']} échecs"
+            )
+            
             # Génère le rapport
             report = result.to_dict()
             self.generate_output(report)
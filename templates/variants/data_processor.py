@@ -11,32 +11,92 @@ Template spécialisé pour le traitement de données avec:
 """
 
 import csv
-import json
+import os
+import shutil
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 from typing import (
-    Any, Dict, Generator, Generic, Iterator, List, 
+    Any, Deque, Dict, Generator, Generic, Iterable, Iterator, List, 
     Optional, TypeVar, Union
 )
 import sys
 
 from ..script_template import (
-    AsyncScriptBase, ScriptBase, ScriptError,
-    ScriptErrorLevel, ScriptHooks
+    AsyncScriptBase, Progress, ScriptBase, ScriptError,
+    ScriptErrorLevel, ScriptHooks, _DATACLASS_SLOTS, _json_dumps, _json_loads
 )
 
+try:
+    import ijson
+except ImportError:  # ijson est optionnel, sans lui le JSON est chargé en entier
+    ijson = None
+
+def _starts_with_array(f) -> bool:
+    """Vérifie si le document JSON ouvert en binaire est un tableau, puis revient au début"""
+    while True:
+        char = f.read(1)
+        if not char or not char.isspace():
+            f.seek(0)
+            return char == b'['
+
+def _write_json_array(f, items: Iterable[Any]) -> None:
+    """
+    Écrit un tableau JSON élément par élément, sans construire la liste.
+    
+    Les octets écrits sont ceux de _json_dumps(list(items)) : chaque élément
+    est encodé seul puis indenté d'un niveau (un saut de ligne n'apparaît
+    jamais dans une chaîne JSON encodée).
+    """
+    separator = b'[\n  '
+    for item in items:
+        f.write(separator)
+        f.write(_json_dumps(item).replace(b'\n', b'\n  '))
+        separator = b',\n  '
+    f.write(b'[]' if separator == b'[\n  ' else b'\n]')
+
+def _apply_transformers(
+    transformers: List['DataTransformer'],
+    chunk: 'DataChunk[Any]'
+) -> 'DataChunk[Any]':
+    """Applique une chaîne de transformations à un lot (aussi exécuté dans les processus de travail)"""
+    for transformer in transformers:
+        chunk = transformer.bulk_transform(chunk)
+    return chunk
+
 # Types génériques pour les données
 DataT = TypeVar('DataT')
 ResultT = TypeVar('ResultT')
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DataChunk(Generic[DataT]):
-    """Représente un lot de données à traiter"""
-    data: List[DataT]
+    """
+    Représente un lot de données à traiter.
+    
+    data est soit une liste d'éléments, soit (lecture CSV) un dict
+    colonne -> liste de valeurs, sans dict alloué par ligne.
+    """
+    data: Union[List[DataT], Dict[str, List[Any]]]
     index: int
     total_chunks: int
     metadata: Optional[Dict[str, Any]] = None
+    
+    @property
+    def is_columnar(self) -> bool:
+        """Indique si les données sont stockées par colonnes"""
+        return isinstance(self.data, dict)
+    
+    def rows(self) -> Iterable[Any]:
+        """Itère sur les éléments du lot, ligne par ligne quel que soit le stockage"""
+        if self.is_columnar:
+            headers = list(self.data)
+            return (dict(zip(headers, values)) for values in zip(*self.data.values()))
+        return self.data
 
 class DataTransformer(Generic[DataT, ResultT]):
     """Interface pour les transformations de données"""
@@ -47,9 +107,54 @@ class DataTransformer(Generic[DataT, ResultT]):
         raise NotImplementedError()
     
     def bulk_transform(self, chunk: DataChunk[DataT]) -> DataChunk[ResultT]:
-        """Transforme un lot de données"""
+        """
+        Transforme un lot de données.
+        
+        Le lot peut être stocké par colonnes; l'implémentation par défaut
+        le parcourt ligne par ligne. Une sous-classe travaillant par
+        colonnes peut surcharger cette méthode pour éviter la conversion.
+        """
+        return DataChunk(
+            data=[self.transform(item) for item in chunk.rows()],
+            index=chunk.index,
+            total_chunks=chunk.total_chunks,
+            metadata=chunk.metadata
+        )
+
+class NumericTransformer(DataTransformer[Dict[str, Any], Dict[str, Any]]):
+    """
+    Transformation numérique appliquée colonne par colonne.
+    
+    kernel reçoit toutes les valeurs d'une colonne du lot et retourne la
+    liste transformée : une sous-classe peut l'implémenter avec NumPy ou un
+    noyau compilé (numba.njit) sans appel Python par ligne.
+    """
+    
+    # Colonnes transformées (toutes si None)
+    columns: Optional[List[str]] = None
+    
+    @abstractmethod
+    def kernel(self, values: List[float]) -> List[float]:
+        """Transforme les valeurs d'une colonne"""
+        raise NotImplementedError()
+    
+    def transform(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Transforme une ligne (lots stockés par lignes)"""
+        result = dict(data)
+        for column in self.columns or list(data):
+            result[column] = self.kernel([float(data[column])])[0]
+        return result
+    
+    def bulk_transform(self, chunk: DataChunk[Dict[str, Any]]) -> DataChunk[Dict[str, Any]]:
+        """Applique le noyau une fois par colonne sur les lots stockés par colonnes"""
+        if not chunk.is_columnar:
+            return super().bulk_transform(chunk)
+            
+        columns = dict(chunk.data)
+        for column in self.columns or list(columns):
+            columns[column] = self.kernel(list(map(float, columns[column])))
         return DataChunk(
-            data=[self.transform(item) for item in chunk.data],
+            data=columns,
             index=chunk.index,
             total_chunks=chunk.total_chunks,
             metadata=chunk.metadata
@@ -88,61 +193,136 @@ class DataProcessor(ScriptBase[DataT, ResultT], ScriptHooks):
         self.transformers.append(transformer)
     
     def read_csv(self, path: Path) -> Generator[DataChunk[Dict[str, Any]], None, None]:
-        """Lit un fichier CSV par lots"""
-        with open(path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            chunk: List[Dict[str, Any]] = []
+        """
+        Lit un fichier CSV par lots.
+        
+        Chaque lot est stocké par colonnes (en-tête -> liste de valeurs) :
+        aucun dict n'est alloué par ligne.
+        """
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            headers = next(reader, None)
+            if not headers:
+                return
             chunk_index = 0
             
-            for row in reader:
-                chunk.append(row)
-                if len(chunk) >= self.chunk_size:
-                    yield DataChunk(chunk, chunk_index, -1)
-                    chunk = []
-                    chunk_index += 1
-                    
-            if chunk:
-                yield DataChunk(chunk, chunk_index, -1)
+            width = len(headers)
+            while True:
+                batch = list(islice(reader, self.chunk_size))
+                if not batch:
+                    break
+                # Lignes vides ignorées comme le fait DictReader
+                rows = [row for row in batch if row]
+                if not rows:
+                    continue
+                # Lignes courtes complétées comme le fait DictReader (restval None)
+                if any(len(row) < width for row in rows):
+                    rows = [row + [None] * (width - len(row)) for row in rows]
+                columns = zip(*rows)
+                yield DataChunk(
+                    {header: list(values) for header, values in zip(headers, columns)},
+                    chunk_index,
+                    -1
+                )
+                chunk_index += 1
     
     def read_json(self, path: Path) -> Generator[DataChunk[Dict[str, Any]], None, None]:
-        """Lit un fichier JSON par lots"""
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                total_chunks = (len(data) + self.chunk_size - 1) // self.chunk_size
-                for i in range(0, len(data), self.chunk_size):
-                    chunk = data[i:i + self.chunk_size]
-                    yield DataChunk(chunk, i // self.chunk_size, total_chunks)
-            else:
-                yield DataChunk([data], 0, 1)
+        """
+        Lit un fichier JSON par lots.
+        
+        Si ijson est installé, un tableau racine est lu en flux : seuls
+        chunk_size éléments sont en mémoire à la fois et le nombre total de
+        lots est inconnu (-1).
+        """
+        if ijson is not None:
+            with open(path, 'rb') as f:
+                if _starts_with_array(f):
+                    items = ijson.items(f, 'item', use_float=True)
+                    chunk_index = 0
+                    while True:
+                        chunk = list(islice(items, self.chunk_size))
+                        if not chunk:
+                            break
+                        yield DataChunk(chunk, chunk_index, -1)
+                        chunk_index += 1
+                    return
+                    
+        data = _json_loads(path.read_bytes())
+        if isinstance(data, list):
+            chunk_size = self.chunk_size
+            size = len(data)
+            total_chunks = (size + chunk_size - 1) // chunk_size
+            for i in range(0, size, chunk_size):
+                yield DataChunk(data[i:i + chunk_size], i // chunk_size, total_chunks)
+        else:
+            yield DataChunk([data], 0, 1)
     
     def process_chunk(self, chunk: DataChunk[Any]) -> DataChunk[Any]:
         """Applique toutes les transformations à un lot"""
-        result = chunk
-        for transformer in self.transformers:
-            result = transformer.bulk_transform(result)
-        return result
+        return _apply_transformers(self.transformers, chunk)
+    
+    def process_chunks_parallel(
+        self,
+        chunks: Iterable[DataChunk[Any]],
+        workers: int
+    ) -> Iterator[DataChunk[Any]]:
+        """
+        Applique les transformations aux lots dans un pool de processus.
+        
+        Les lots sont rendus dans l'ordre de lecture, et au plus
+        2 * workers lots sont en cours à la fois pour borner la mémoire.
+        Les transformateurs doivent être picklables (classes définies au
+        niveau d'un module).
+        """
+        worker = partial(_apply_transformers, self.transformers)
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(worker, chunk))
+            while pending:
+                yield pending.popleft().result()
     
     def write_results(self, results: Iterator[DataChunk[ResultT]], output_path: Path) -> None:
         """Écrit les résultats dans un fichier"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                # Détermine le format de sortie
-                if output_path.suffix == '.csv':
+            # Détermine le format de sortie
+            if output_path.suffix == '.csv':
+                with open(output_path, 'w', encoding='utf-8') as f:
                     writer = None
                     for chunk in results:
                         if not writer and chunk.data:
                             # Initialise le writer avec les en-têtes du premier élément
-                            headers = chunk.data[0].keys()
-                            writer = csv.DictWriter(f, fieldnames=headers)
-                            writer.writeheader()
-                        writer.writerows(chunk.data)
-                else:
-                    # Par défaut, écrit en JSON
-                    all_data = []
-                    for chunk in results:
-                        all_data.extend(chunk.data)
-                    json.dump(all_data, f, indent=2, ensure_ascii=False)
+                            if chunk.is_columnar:
+                                headers = list(chunk.data)
+                            else:
+                                headers = list(chunk.data[0].keys())
+                            writer = csv.writer(f)
+                            writer.writerow(headers)
+                            # Extraction des champs d'une ligne en C, toujours en tuple
+                            if len(headers) == 1:
+                                header = headers[0]
+                                row_values = lambda row: (row[header],)
+                            else:
+                                row_values = itemgetter(*headers)
+                        if chunk.is_columnar:
+                            # Lot par colonnes : lignes reformées par zip, sans dict par ligne
+                            writer.writerows(zip(*(chunk.data[header] for header in headers)))
+                        else:
+                            try:
+                                rows = list(map(row_values, chunk.data))
+                            except KeyError:
+                                # Champs absents écrits vides, comme DictWriter (restval '')
+                                rows = [[row.get(header, '') for header in headers] for row in chunk.data]
+                            writer.writerows(rows)
+            else:
+                # Par défaut, écrit en JSON (orjson si disponible), lot par lot
+                with open(output_path, 'wb') as f:
+                    _write_json_array(
+                        f,
+                        (item for chunk in results for item in chunk.rows())
+                    )
                     
         except Exception as e:
             raise ScriptError(
@@ -150,6 +330,46 @@ class DataProcessor(ScriptBase[DataT, ResultT], ScriptHooks):
                 ScriptErrorLevel.ERROR
             )
     
+    def _with_progress(
+        self,
+        chunks: Iterable[DataChunk[Any]],
+        step: Progress
+    ) -> Iterator[DataChunk[Any]]:
+        """
+        Transmet les lots inchangés en mettant à jour la progression.
+        
+        La progression n'est mise à jour que lorsque le pourcentage entier
+        change, avec l'écart depuis la dernière mise à jour.
+        """
+        update = self.progress.update
+        last_percent = 0
+        for chunk in chunks:
+            yield chunk
+            
+            # Met à jour la progression (arithmétique entière, 100 au dernier lot)
+            total_chunks = chunk.total_chunks
+            if total_chunks > 0:
+                percent = (chunk.index + 1) * 100 // total_chunks
+                if percent != last_percent:
+                    update(step, percent - last_percent)
+                    last_percent = percent
+    
+    def _can_copy_through(self, input_path: Path, output_path: Path) -> bool:
+        """
+        Vérifie si la sortie peut être une simple copie de l'entrée.
+        
+        C'est le cas sans transformateur et avec le même format en entrée et
+        en sortie; un JSON doit être un tableau, tout autre document étant
+        enveloppé dans une liste à l'écriture.
+        """
+        suffix = input_path.suffix
+        if self.transformers or suffix != output_path.suffix:
+            return False
+        if suffix == '.csv':
+            return True
+        with open(input_path, 'rb') as f:
+            return _starts_with_array(f)
+    
     def execute(self) -> bool:
         """Exécute le traitement des données"""
         try:
@@ -162,25 +382,31 @@ class DataProcessor(ScriptBase[DataT, ResultT], ScriptHooks):
             else:
                 reader = self.read_json
             
+            # L'entrée est lue au fil de l'écriture : la sortie ne peut pas la remplacer
+            if output_path.exists() and os.path.samefile(input_path, output_path):
+                raise ScriptError(
+                    f"Le fichier de sortie est le fichier d'entrée: {output_path}",
+                    ScriptErrorLevel.ERROR
+                )
+            
             # Crée une étape de progression
             step = self.progress.add_step(100, "Traitement des données")
             
-            # Traite les données par lots
-            chunks = reader(input_path)
-            processed_chunks = []
-            
-            for chunk in chunks:
-                # Traite le lot
-                processed = self.process_chunk(chunk)
-                processed_chunks.append(processed)
-                
-                # Met à jour la progression
-                if chunk.total_chunks > 0:
-                    progress = (chunk.index + 1) / chunk.total_chunks * 100
-                    self.progress.update(step, int(progress))
+            # Sans transformation, les données sont recopiées telles quelles
+            if self._can_copy_through(input_path, output_path):
+                shutil.copyfile(input_path, output_path)
+                self.progress.update(step, 100)
+                return True
             
-            # Écrit les résultats
-            self.write_results(iter(processed_chunks), output_path)
+            # Traite les données par lots, en flux jusqu'à l'écriture :
+            # seuls les lots en cours de traitement sont en mémoire
+            chunks = reader(input_path)
+            workers = getattr(self.args, 'workers', None) or 1
+            if workers > 1 and self.transformers:
+                processed = self.process_chunks_parallel(chunks, workers)
+            else:
+                processed = (self.process_chunk(chunk) for chunk in chunks)
+            self.write_results(self._with_progress(processed, step), output_path)
             
             return True
             
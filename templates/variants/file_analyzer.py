@@ -10,20 +10,278 @@ Template spécialisé pour l'analyse de fichiers avec:
 - Statistiques avancées
 """
 
+import collections
 import hashlib
 import magic
+import math
 import mimetypes
+import mmap
 import os
 import re
+import sqlite3
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Set, Tuple
 import sys
 
 from ..script_template import ScriptBase, ScriptError, ScriptErrorLevel, ScriptHooks
 
+# Découpage en mots des fichiers texte, compilé une fois
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Table de traduction des octets ASCII : minuscules pour les lettres,
+# espace pour tout caractère hors mot (\w ASCII : lettres, chiffres et _)
+_ASCII_WORD_CHARS = frozenset(b'abcdefghijklmnopqrstuvwxyz0123456789_')
+_ASCII_WORD_TABLE = bytes(
+    (byte | 0x20) if 65 <= byte <= 90
+    else byte if byte in _ASCII_WORD_CHARS
+    else 0x20
+    for byte in range(256)
+)
+
+# Encodages où un contenu ASCII se lit octet par octet
+_ASCII_COMPATIBLE = frozenset({'us-ascii', 'ascii', 'utf-8', 'utf8'})
+
+# Octets admis dans un fichier texte, comme dans l'heuristique de file(1) :
+# caractères imprimables, octets hauts et contrôles usuels (\a \b \t \n \v \f \r ESC)
+_TEXT_BYTES = bytes(sorted({7, 8, 9, 10, 11, 12, 13, 27} | set(range(0x20, 0x100))))
+
+# Octets lus en tête de fichier pour distinguer texte et binaire
+TEXT_PEEK_SIZE = 8192
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel, l'histogramme passe alors par Counter
+    np = None
+
+try:
+    import re2
+except ImportError:  # google-re2 est optionnel, les patterns passent alors par re
+    re2 = None
+
+# Cache disque des métadonnées (hashes, type MIME, encodage) entre exécutions
+METADATA_CACHE_PATH = Path(
+    os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+) / 'devtoolbox' / 'file-metadata.sqlite3'
+
+# Taille des tranches passées aux fonctions de hachage sur un fichier projeté
+# en mémoire : chaque appel hache une tranche entière en C, sans boucle Python
+HASH_SLICE_SIZE = 16 << 20
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """Indique au noyau l'usage prévu d'un fichier (sans effet hors POSIX)"""
+    advice = getattr(os, advice_name, None)
+    if advice is not None and hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError:
+            pass
+
+def _hash_file(path: Path, *hashes) -> None:
+    """
+    Alimente les objets de hachage avec le contenu du fichier, via mmap.
+    
+    Le fichier est lu séquentiellement une seule fois : la lecture anticipée
+    est élargie. Ses pages restent dans le cache pour les exécutions
+    suivantes et les autres processus.
+    """
+    with open(path, 'rb') as f:
+        # mmap refuse les fichiers vides, dont le hash est celui de b''
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        _fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                for start in range(0, len(view), HASH_SLICE_SIZE):
+                    with view[start:start + HASH_SLICE_SIZE] as part:
+                        for h in hashes:
+                            h.update(part)
+
+def _iter_files(directory: Path) -> Iterator[Path]:
+    """
+    Parcourt les fichiers de l'arborescence comme rglob('*') + is_file().
+    
+    Le type de chaque entrée vient du DirEntry lu avec le répertoire : seuls
+    les liens symboliques coûtent un stat. Les liens vers des répertoires ne
+    sont pas suivis; les répertoires illisibles sont ignorés.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    subdirs = []
+    for entry in entries:
+        try:
+            if entry.is_file():
+                yield Path(entry.path)
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+        except OSError:
+            pass
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+def _read_file(path: Path) -> bytes:
+    """Lit un fichier en entier, avec la même indication au noyau que _hash_file"""
+    with open(path, 'rb') as f:
+        _fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+        content = f.read()
+    return content
+
+def _compile_pattern(pattern: str) -> Any:
+    """
+    Compile un pattern de recherche.
+    
+    Avec RE2 (automate, temps linéaire garanti), un pattern fourni par
+    l'utilisateur ne peut pas provoquer de backtracking catastrophique.
+    Les syntaxes que RE2 ne supporte pas (références arrière, lookaround)
+    sont compilées avec re.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+@lru_cache(maxsize=None)
+def _magic(**kwargs) -> 'magic.Magic':
+    """
+    Détecteur libmagic partagé, créé une fois par processus et par option :
+    chaque construction recharge la base de signatures.
+    """
+    return magic.Magic(**kwargs)
+
+def _sniff_mime_type(path: Path, peek: bytes) -> str:
+    """
+    Type MIME déduit des premiers octets et de l'extension, sans libmagic.
+    
+    Seule la distinction texte/binaire vient du contenu : un octet de
+    contrôle inhabituel (NUL compris) signale un fichier binaire.
+    """
+    if not peek:
+        return 'application/x-empty'
+    guessed, _ = mimetypes.guess_type(path.name)
+    if peek.translate(None, _TEXT_BYTES):
+        if guessed and not guessed.startswith('text/'):
+            return guessed
+        return 'application/octet-stream'
+    if guessed and guessed.startswith('text/'):
+        return guessed
+    return 'text/plain'
+
+def _sniff_encoding(data: bytes) -> Optional[str]:
+    """Encodage d'un texte complet s'il est ASCII ou UTF-8, None sinon"""
+    if data.isascii():
+        return 'us-ascii'
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    return 'utf-8'
+
+def _byte_histogram(content: bytes) -> List[int]:
+    """Nombre d'occurrences de chaque valeur d'octet, compté en C"""
+    if np is not None:
+        return np.bincount(
+            np.frombuffer(content, dtype=np.uint8),
+            minlength=256
+        ).tolist()
+    counts = collections.Counter(content)
+    return [counts[byte] for byte in range(256)]
+
+def _shannon_entropy(byte_counts: List[int], total: int) -> float:
+    """Entropie de Shannon en bits par octet : somme(p * log2(1 / p))"""
+    if not total:
+        return 0.0
+    if np is not None:
+        counts = np.asarray(byte_counts, dtype=np.float64)
+        p = counts[counts > 0] / total
+        return float((p * np.log2(1 / p)).sum())
+    return sum(
+        count / total * math.log2(total / count)
+        for count in byte_counts if count
+    )
+
+class MetadataCache:
+    """
+    Cache SQLite des métadonnées coûteuses d'un fichier.
+    
+    La clé (st_dev, st_ino, st_mtime_ns, st_size) change dès que le fichier
+    est modifié ou remplacé : une entrée trouvée est toujours à jour. La
+    connexion est ouverte au premier accès, dans chaque processus. Une
+    erreur du cache n'interrompt jamais l'analyse, elle vaut un défaut.
+    """
+    
+    def __init__(self, path: Path = METADATA_CACHE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        
+    def __getstate__(self) -> Dict[str, Any]:
+        """La connexion n'est pas transmise aux processus de travail"""
+        return {'path': self.path, '_conn': None}
+        
+    def _connection(self) -> sqlite3.Connection:
+        """Ouvre la base au premier accès"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit sans fsync : une entrée perdue est simplement recalculée
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "dev INTEGER, ino INTEGER, mtime_ns INTEGER, size INTEGER, "
+                "md5 TEXT, sha256 TEXT, mime_type TEXT, encoding TEXT, precise INTEGER, "
+                "PRIMARY KEY (dev, ino, mtime_ns, size))"
+            )
+            self._conn = conn
+        return self._conn
+        
+    @staticmethod
+    def _key(stats: os.stat_result) -> Tuple[int, int, int, int]:
+        return stats.st_dev, stats.st_ino, stats.st_mtime_ns, stats.st_size
+        
+    def get(self, stats: os.stat_result) -> Optional[Tuple[str, str, str, Optional[str], int]]:
+        """
+        Retourne (md5, sha256, type MIME, encodage, précis) ou None; précis
+        indique un type MIME détecté par libmagic
+        """
+        try:
+            return self._connection().execute(
+                "SELECT md5, sha256, mime_type, encoding, precise FROM metadata "
+                "WHERE dev = ? AND ino = ? AND mtime_ns = ? AND size = ?",
+                self._key(stats)
+            ).fetchone()
+        except (sqlite3.Error, OSError):
+            return None
+            
+    def put(
+        self,
+        stats: os.stat_result,
+        md5: str,
+        sha256: str,
+        mime_type: str,
+        encoding: Optional[str],
+        precise: bool = False
+    ) -> None:
+        """Enregistre les métadonnées calculées d'un fichier"""
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*self._key(stats), md5, sha256, mime_type, encoding, int(precise))
+            )
+        except (sqlite3.Error, OSError):
+            pass
+
 @dataclass
 class FileMetadata:
     """Structure pour les métadonnées de fichier"""
@@ -36,29 +294,146 @@ class FileMetadata:
     hash_md5: str
     hash_sha256: str
     
+    # MD5 n'est calculé que sur demande : SHA-256 suffit à identifier un
+    # fichier, et un seul hachage divise par deux le travail par octet
+    compute_md5: ClassVar[bool] = False
+    
+    # libmagic n'est consulté que sur demande : la distinction texte/binaire
+    # se fait sur les premiers octets et le type précis vient de l'extension
+    precise_mime: ClassVar[bool] = False
+    
     @classmethod
-    def from_path(cls, path: Path) -> 'FileMetadata':
-        """Crée les métadonnées à partir d'un chemin"""
-        stats = path.stat()
+    def from_path(cls, path: Path, cache: Optional[MetadataCache] = None) -> 'FileMetadata':
+        """
+        Crée les métadonnées à partir d'un chemin.
         
-        # Détection du type MIME et encodage
-        mime = magic.Magic(mime=True)
-        mime_type = mime.from_file(str(path))
+        Avec un cache, un fichier inchangé depuis son dernier passage n'est
+        ni lu ni haché.
+        """
+        stats = path.stat()
+        cached = cls._from_cache(path, stats, cache)
+        if cached is not None:
+            return cached
         
-        # Détection de l'encodage pour les fichiers texte
-        encoding = None
-        if mime_type.startswith('text/'):
-            magic_encoding = magic.Magic(mime_encoding=True)
-            encoding = magic_encoding.from_file(str(path))
+        # Détection du type MIME et encodage, sur les premiers octets :
+        # libmagic ne rouvre pas le fichier
+        with open(path, 'rb') as f:
+            peek = f.read(TEXT_PEEK_SIZE)
+        mime_type, encoding = cls._detect_type(
+            path, peek, complete=stats.st_size <= len(peek)
+        )
         
-        # Calcul des hashes
-        md5 = hashlib.md5()
+        # Calcul des hashes, en un seul passage sur le fichier
         sha256 = hashlib.sha256()
-        with open(path, 'rb') as f:
-            while chunk := f.read(8192):
-                md5.update(chunk)
-                sha256.update(chunk)
+        md5 = hashlib.md5() if cls.compute_md5 else None
+        _hash_file(path, *filter(None, (sha256, md5)))
+        
+        return cls._create(path, stats, mime_type, encoding, md5, sha256, cache)
+    
+    @classmethod
+    def from_content(
+        cls,
+        path: Path,
+        content: bytes,
+        cache: Optional[MetadataCache] = None
+    ) -> 'FileMetadata':
+        """
+        Crée les métadonnées à partir du contenu déjà lu du fichier.
+        
+        Le type MIME, l'encodage et les hashes sont calculés sur le buffer :
+        le fichier n'est pas relu. Avec un cache, ils ne sont calculés que
+        pour un fichier modifié depuis son dernier passage.
+        """
+        stats = path.stat()
+        cached = cls._from_cache(path, stats, cache)
+        if cached is not None:
+            return cached
+        
+        mime_type, encoding = cls._detect_type(path, content, complete=True)
+        
+        sha256 = hashlib.sha256(content)
+        md5 = hashlib.md5(content) if cls.compute_md5 else None
         
+        return cls._create(path, stats, mime_type, encoding, md5, sha256, cache)
+    
+    @classmethod
+    def _detect_type(
+        cls,
+        path: Path,
+        content: bytes,
+        complete: bool
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Type MIME et encodage (fichiers texte uniquement) d'un contenu.
+        
+        Args:
+            path: Fichier, dont l'extension précise le type hors libmagic
+            content: Contenu du fichier, ou ses premiers octets
+            complete: content couvre le fichier entier
+        """
+        if cls.precise_mime:
+            mime_type = _magic(mime=True).from_buffer(content)
+        else:
+            mime_type = _sniff_mime_type(path, content[:TEXT_PEEK_SIZE])
+        
+        # Détection de l'encodage pour les fichiers texte; hors precise_mime,
+        # libmagic ne sert qu'aux textes ni ASCII ni UTF-8, ou lus en partie
+        encoding = None
+        if mime_type.startswith('text/'):
+            if complete and not cls.precise_mime:
+                encoding = _sniff_encoding(content)
+            if encoding is None:
+                encoding = _magic(mime_encoding=True).from_buffer(content)
+        return mime_type, encoding
+    
+    @classmethod
+    def _from_cache(
+        cls,
+        path: Path,
+        stats: os.stat_result,
+        cache: Optional[MetadataCache]
+    ) -> Optional['FileMetadata']:
+        """Métadonnées en cache du fichier, si elles couvrent la demande"""
+        if cache is None:
+            return None
+        entry = cache.get(stats)
+        if entry is None:
+            return None
+        md5, sha256, mime_type, encoding, precise = entry
+        # Entrée enregistrée sans MD5, ou sans libmagic, alors qu'il est demandé
+        if (cls.compute_md5 and not md5) or (cls.precise_mime and not precise):
+            return None
+        return cls._build(path, stats, mime_type, encoding, md5, sha256)
+    
+    @classmethod
+    def _create(
+        cls,
+        path: Path,
+        stats: os.stat_result,
+        mime_type: str,
+        encoding: Optional[str],
+        md5: Optional[Any],
+        sha256: Any,
+        cache: Optional[MetadataCache] = None
+    ) -> 'FileMetadata':
+        """Assemble les métadonnées calculées et les enregistre dans le cache"""
+        md5_hex = md5.hexdigest() if md5 else ""
+        sha256_hex = sha256.hexdigest()
+        if cache is not None:
+            cache.put(stats, md5_hex, sha256_hex, mime_type, encoding, cls.precise_mime)
+        return cls._build(path, stats, mime_type, encoding, md5_hex, sha256_hex)
+    
+    @classmethod
+    def _build(
+        cls,
+        path: Path,
+        stats: os.stat_result,
+        mime_type: str,
+        encoding: Optional[str],
+        md5_hex: str,
+        sha256_hex: str
+    ) -> 'FileMetadata':
+        """Construit les métadonnées d'un fichier"""
         return cls(
             path=path,
             size=stats.st_size,
@@ -66,8 +441,8 @@ class FileMetadata:
             modified=datetime.fromtimestamp(stats.st_mtime),
             mime_type=mime_type,
             encoding=encoding,
-            hash_md5=md5.hexdigest(),
-            hash_sha256=sha256.hexdigest()
+            hash_md5=md5_hex,
+            hash_sha256=sha256_hex
         )
 
 @dataclass
@@ -102,27 +477,58 @@ class ContentAnalyzer:
     """Interface pour les analyseurs de contenu spécifiques"""
     
     @abstractmethod
-    def analyze(self, content: bytes, metadata: FileMetadata) -> Dict[str, Any]:
-        """Analyse le contenu et retourne les statistiques"""
+    def analyze(
+        self,
+        content: bytes,
+        metadata: FileMetadata,
+        text: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyse le contenu et retourne les statistiques.
+        
+        Args:
+            content: Contenu brut du fichier
+            metadata: Métadonnées du fichier
+            text: Contenu déjà décodé selon metadata.encoding, s'il l'a été
+        """
         raise NotImplementedError()
 
 class TextAnalyzer(ContentAnalyzer):
     """Analyseur pour les fichiers texte"""
     
-    def analyze(self, content: bytes, metadata: FileMetadata) -> Dict[str, Any]:
+    def analyze(
+        self,
+        content: bytes,
+        metadata: FileMetadata,
+        text: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Analyse un fichier texte"""
         try:
-            text = content.decode(metadata.encoding or 'utf-8')
+            encoding = metadata.encoding or 'utf-8'
+            if text is None:
+                text = content.decode(encoding)
             lines = text.splitlines()
-            words = re.findall(r'\b\w+\b', text.lower())
+            if encoding.lower() in _ASCII_COMPATIBLE and content.isascii():
+                # Contenu ASCII : minuscules et séparation des mots en une
+                # seule traduction d'octets, sans copie minuscule du texte
+                words = content.translate(_ASCII_WORD_TABLE).split()
+            else:
+                words = _WORD_RE.findall(text.lower())
+            
+            # Agrégats calculés par map() sur des méthodes C, sans
+            # générateur Python par ligne ou par mot
+            total_line_length = sum(map(len, lines))
+            total_word_length = sum(map(len, words))
+            # Une ligne vide ou faite d'espaces est celle que strip() vide
+            empty_lines = lines.count('') + sum(map(str.isspace, lines))
             
             return {
                 "line_count": len(lines),
                 "word_count": len(words),
                 "char_count": len(text),
-                "avg_line_length": sum(len(line) for line in lines) / len(lines) if lines else 0,
-                "avg_word_length": sum(len(word) for word in words) / len(words) if words else 0,
-                "empty_lines": sum(1 for line in lines if not line.strip()),
+                "avg_line_length": total_line_length / len(lines) if lines else 0,
+                "avg_word_length": total_word_length / len(words) if words else 0,
+                "empty_lines": empty_lines,
                 "unique_words": len(set(words))
             }
         except Exception as e:
@@ -134,13 +540,16 @@ class TextAnalyzer(ContentAnalyzer):
 class BinaryAnalyzer(ContentAnalyzer):
     """Analyseur pour les fichiers binaires"""
     
-    def analyze(self, content: bytes, metadata: FileMetadata) -> Dict[str, Any]:
+    def analyze(
+        self,
+        content: bytes,
+        metadata: FileMetadata,
+        text: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Analyse un fichier binaire"""
         try:
             # Analyse basique de la distribution des octets
-            byte_counts = [0] * 256
-            for byte in content:
-                byte_counts[byte] += 1
+            byte_counts = _byte_histogram(content)
                 
             # Calcul de statistiques
             total_bytes = len(content)
@@ -149,10 +558,7 @@ class BinaryAnalyzer(ContentAnalyzer):
             return {
                 "file_size": total_bytes,
                 "unique_bytes": non_zero_bytes,
-                "entropy": sum(
-                    -(count/total_bytes) * (count/total_bytes).bit_length()
-                    for count in byte_counts if count > 0
-                ),
+                "entropy": _shannon_entropy(byte_counts, total_bytes),
                 "null_byte_ratio": byte_counts[0] / total_bytes if total_bytes > 0 else 0
             }
         except Exception as e:
@@ -161,6 +567,104 @@ class BinaryAnalyzer(ContentAnalyzer):
                 ScriptErrorLevel.ERROR
             )
 
+def _analyze_path(
+    path: Path,
+    analyzers: Dict[str, ContentAnalyzer],
+    patterns: Dict[str, Any],
+    cache: Optional[MetadataCache]
+) -> AnalysisResult:
+    """Analyse un fichier avec les analyseurs et patterns (compilés) donnés"""
+    try:
+        # Lecture du contenu, une seule fois : les métadonnées en sont tirées
+        content = _read_file(path)
+        metadata = FileMetadata.from_content(path, content, cache)
+        
+        # Sélection de l'analyseur approprié; un fichier texte est décodé
+        # une seule fois, pour l'analyseur et pour les patterns
+        is_text = metadata.mime_type.startswith('text/')
+        text: Optional[str] = None
+        if is_text:
+            analyzer = analyzers['text']
+            text = content.decode(metadata.encoding or 'utf-8')
+        else:
+            analyzer = analyzers['binary']
+        
+        # Analyse du contenu
+        content_stats = analyzer.analyze(content, metadata, text)
+        
+        # Recherche des patterns
+        patterns_found = {}
+        if is_text:
+            for name, pattern in patterns.items():
+                matches = pattern.findall(text)
+                if matches:
+                    patterns_found[name] = matches
+        
+        # Détection des problèmes potentiels
+        issues = []
+        if metadata.size == 0:
+            issues.append("Fichier vide")
+        if is_text and content_stats['empty_lines'] > content_stats['line_count'] * 0.5:
+            issues.append("Proportion élevée de lignes vides")
+        
+        # Calcul d'un score basique
+        score = 1.0
+        if issues:
+            score *= 0.8
+        
+        return AnalysisResult(
+            metadata=metadata,
+            content_stats=content_stats,
+            patterns_found=patterns_found,
+            issues=issues,
+            score=score
+        )
+        
+    except Exception as e:
+        raise ScriptError(
+            f"Erreur d'analyse du fichier {path}: {str(e)}",
+            ScriptErrorLevel.ERROR
+        )
+
+def _analyze_to_dict(
+    analyze: Callable[[Path], AnalysisResult],
+    path: Path
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Analyse un fichier et retourne (résultat, None) ou (None, message
+    d'erreur) : le résultat est déjà converti en dict pour limiter ce qui
+    revient au processus parent.
+    """
+    try:
+        return analyze(path).to_dict(), None
+    except Exception as e:
+        return None, str(e)
+
+# État d'un processus de travail, préparé une fois par _init_worker
+_worker_state: Dict[str, Any] = {}
+
+def _init_worker(
+    analyzers: Dict[str, ContentAnalyzer],
+    pattern_sources: Dict[str, str],
+    cache_path: Optional[Path],
+    metadata_options: Dict[str, bool]
+) -> None:
+    """
+    Prépare un processus de travail à partir du seul état nécessaire :
+    les patterns sont recompilés sur place, le cache rouvert à la demande.
+    """
+    for name, value in metadata_options.items():
+        setattr(FileMetadata, name, value)
+    _worker_state.update(
+        analyzers=analyzers,
+        patterns={name: _compile_pattern(p) for name, p in pattern_sources.items()},
+        cache=MetadataCache(cache_path) if cache_path is not None else None
+    )
+
+def _analyze_in_worker(path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Analyse un fichier dans un processus de travail"""
+    return _analyze_to_dict(partial(_analyze_path, **_worker_state), path)
+
 class FileAnalyzer(ScriptBase[Path, AnalysisResult], ScriptHooks):
     """Base pour les scripts d'analyse de fichiers"""
     
@@ -170,7 +674,15 @@ class FileAnalyzer(ScriptBase[Path, AnalysisResult], ScriptHooks):
             'text': TextAnalyzer(),
             'binary': BinaryAnalyzer()
         }
-        self.patterns: Dict[str, str] = {}
+        # Patterns compilés une fois à l'ajout (RE2 ou re), réutilisés pour chaque fichier;
+        # leurs sources sont transmises aux processus de travail
+        self.patterns: Dict[str, Any] = {}
+        self.pattern_sources: Dict[str, str] = {}
+        # Cache des hashes et types MIME entre exécutions, sur demande (cache) :
+        # il écrit sous ~/.cache sans synchronisation disque
+        self.metadata_cache: Optional[MetadataCache] = (
+            MetadataCache() if getattr(self.args, 'cache', False) else None
+        )
         
     def pre_validate(self) -> bool:
         """Vérifie la configuration avant analyse"""
@@ -194,61 +706,45 @@ class FileAnalyzer(ScriptBase[Path, AnalysisResult], ScriptHooks):
     
     def add_pattern(self, name: str, pattern: str) -> None:
         """Ajoute un pattern à rechercher"""
-        self.patterns[name] = pattern
+        self.pattern_sources[name] = pattern
+        self.patterns[name] = _compile_pattern(pattern)
     
     def analyze_file(self, path: Path) -> AnalysisResult:
         """Analyse un fichier unique"""
-        try:
-            # Extraction des métadonnées
-            metadata = FileMetadata.from_path(path)
-            
-            # Lecture du contenu
-            with open(path, 'rb') as f:
-                content = f.read()
-            
-            # Sélection de l'analyseur approprié
-            if metadata.mime_type.startswith('text/'):
-                analyzer = self.analyzers['text']
-            else:
-                analyzer = self.analyzers['binary']
-            
-            # Analyse du contenu
-            content_stats = analyzer.analyze(content, metadata)
-            
-            # Recherche des patterns
-            patterns_found = {}
-            if metadata.mime_type.startswith('text/'):
-                text = content.decode(metadata.encoding or 'utf-8')
-                for name, pattern in self.patterns.items():
-                    matches = re.findall(pattern, text)
-                    if matches:
-                        patterns_found[name] = matches
-            
-            # Détection des problèmes potentiels
-            issues = []
-            if metadata.size == 0:
-                issues.append("Fichier vide")
-            if metadata.mime_type.startswith('text/') and content_stats['empty_lines'] > content_stats['line_count'] * 0.5:
-                issues.append("Proportion élevée de lignes vides")
-            
-            # Calcul d'un score basique
-            score = 1.0
-            if issues:
-                score *= 0.8
-            
-            return AnalysisResult(
-                metadata=metadata,
-                content_stats=content_stats,
-                patterns_found=patterns_found,
-                issues=issues,
-                score=score
-            )
-            
-        except Exception as e:
-            raise ScriptError(
-                f"Erreur d'analyse du fichier {path}: {str(e)}",
-                ScriptErrorLevel.ERROR
-            )
+        return _analyze_path(path, self.analyzers, self.patterns, self.metadata_cache)
+    
+    def _analyze_serial(
+        self,
+        paths: List[Path]
+    ) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Analyse les fichiers dans le processus courant"""
+        for path in paths:
+            yield _analyze_to_dict(self.analyze_file, path)
+    
+    def _analyze_parallel(
+        self,
+        paths: List[Path],
+        workers: int
+    ) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Analyse les fichiers dans un pool de processus.
+        
+        Les processus ne reçoivent que l'état de l'analyse (analyseurs,
+        sources des patterns, chemin du cache, options des métadonnées),
+        pas le script lui-même.
+        """
+        cache_path = self.metadata_cache.path if self.metadata_cache is not None else None
+        metadata_options = {
+            'compute_md5': FileMetadata.compute_md5,
+            'precise_mime': FileMetadata.precise_mime
+        }
+        chunksize = max(1, len(paths) // (workers * 8))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.analyzers, self.pattern_sources, cache_path, metadata_options)
+        ) as executor:
+            yield from executor.map(_analyze_in_worker, paths, chunksize=chunksize)
     
     def execute(self) -> bool:
         """Exécute l'analyse des fichiers"""
@@ -260,10 +756,7 @@ class FileAnalyzer(ScriptBase[Path, AnalysisResult], ScriptHooks):
             if input_path.is_file():
                 files_to_analyze.append(input_path)
             elif input_path.is_dir():
-                files_to_analyze.extend(
-                    path for path in input_path.rglob('*')
-                    if path.is_file()
-                )
+                files_to_analyze.extend(_iter_files(input_path))
             
             if not files_to_analyze:
                 raise ScriptError(
@@ -277,16 +770,20 @@ class FileAnalyzer(ScriptBase[Path, AnalysisResult], ScriptHooks):
                 "Analyse des fichiers"
             )
             
-            # Analyse chaque fichier
+            # Analyse les fichiers, en parallèle s'il y en a plusieurs;
+            # résultats dans l'ordre des fichiers
             results = []
-            for file_path in files_to_analyze:
-                try:
-                    result = self.analyze_file(file_path)
-                    results.append(result.to_dict())
-                except Exception as e:
-                    self.logger.warning(f"Échec analyse {file_path}: {str(e)}")
-                finally:
-                    self.progress.update(step)
+            workers = getattr(self.args, 'workers', None) or os.cpu_count() or 1
+            if workers == 1 or len(files_to_analyze) == 1:
+                analyzed = self._analyze_serial(files_to_analyze)
+            else:
+                analyzed = self._analyze_parallel(files_to_analyze, workers)
+            for file_path, (result, error) in zip(files_to_analyze, analyzed):
+                if error is None:
+                    results.append(result)
+                else:
+                    self.logger.warning(f"Échec analyse {file_path}: {error}")
+                self.progress.update(step)
             
             # Génère le rapport
             report = {
@@ -12,6 +12,7 @@ Template spécialisé pour la gestion de projet avec:
 
 import configparser
 import git
+import mmap
 import os
 import re
 import shutil
@@ -21,11 +22,35 @@ from abc import abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 import sys
 
 from ..script_template import ScriptBase, ScriptError, ScriptErrorLevel, ScriptHooks
 
+try:
+    import pygit2
+except ImportError:  # pygit2 est optionnel, git est alors appelé en sous-processus
+    pygit2 = None
+
+# Docstring triple-guillemets, compilée une fois pour tous les fichiers validés
+_DOCSTRING_RE = re.compile(r'"""[\s\S]*?"""')
+
+# Longueur maximale d'une ligne de code
+MAX_LINE_LENGTH = 100
+
+# Lignes trop longues, trouvées par le moteur de regex sans boucle Python par ligne
+_LONG_LINE_RE = re.compile(r'^[^\n]{%d,}' % (MAX_LINE_LENGTH + 1), re.MULTILINE)
+
+# Séparateurs de ligne reconnus par str.splitlines en plus de '\n'
+_OTHER_LINE_BREAKS_RE = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+# Équivalents en octets, pour un source ASCII examiné sans décodage
+_LONG_LINE_BYTES_RE = re.compile(rb'^[^\n]{%d,}' % (MAX_LINE_LENGTH + 1), re.MULTILINE)
+
+# Octets pour lesquels un source doit être relu en texte : non ASCII
+# (longueur en caractères différente) ou séparateurs de ligne autres que '\n'
+_NON_PLAIN_BYTES_RE = re.compile(rb'[\r\x0b\x0c\x1c-\x1e\x80-\xff]')
+
 @dataclass
 class ProjectConfig:
     """Configuration du projet"""
@@ -74,19 +99,15 @@ class GitStatus:
         try:
             # Obtient l'état du dépôt
             branch = repo.active_branch.name
-            status = repo.git.status('--porcelain')
+            # Avec pygit2, libgit2 lit le dépôt dans le processus : pas de
+            # sous-processus git ni de sortie texte à analyser
+            git_repo = pygit2.Repository(repo.git_dir) if pygit2 else None
             
-            # Parse les fichiers modifiés/non suivis
-            modified = []
-            untracked = []
-            for line in status.split('\n'):
-                if line:
-                    status_code = line[:2]
-                    file_path = line[3:]
-                    if status_code.startswith('??'):
-                        untracked.append(file_path)
-                    else:
-                        modified.append(file_path)
+            # Fichiers modifiés/non suivis
+            if git_repo is not None:
+                modified, untracked = cls._status_pygit2(git_repo)
+            else:
+                modified, untracked = cls._status_porcelain(repo)
             
             # Vérifie l'état par rapport à l'origine
             ahead = 0
@@ -94,13 +115,21 @@ class GitStatus:
             if 'origin' in repo.remotes:
                 origin = repo.remotes.origin
                 origin.fetch()
-                ahead_behind = repo.git.rev_list(
-                    '--left-right',
-                    '--count',
-                    f'{branch}...origin/{branch}'
-                ).split()
-                if len(ahead_behind) == 2:
-                    ahead, behind = map(int, ahead_behind)
+                if git_repo is not None:
+                    upstream = git_repo.references.get(f'refs/remotes/origin/{branch}')
+                    if upstream is not None:
+                        ahead, behind = git_repo.ahead_behind(
+                            git_repo.head.target,
+                            upstream.target
+                        )
+                else:
+                    ahead_behind = repo.git.rev_list(
+                        '--left-right',
+                        '--count',
+                        f'{branch}...origin/{branch}'
+                    ).split()
+                    if len(ahead_behind) == 2:
+                        ahead, behind = map(int, ahead_behind)
             
             return cls(
                 branch=branch,
@@ -115,6 +144,62 @@ class GitStatus:
                 f"Erreur d'obtention du status git: {str(e)}",
                 ScriptErrorLevel.ERROR
             )
+    
+    @staticmethod
+    def _status_porcelain(repo: git.Repo) -> Tuple[List[str], List[str]]:
+        """Fichiers modifiés et non suivis, depuis git status --porcelain"""
+        status = repo.git.status('--porcelain')
+        modified = []
+        untracked = []
+        for line in status.split('\n'):
+            if line:
+                status_code = line[:2]
+                file_path = line[3:]
+                if status_code.startswith('??'):
+                    untracked.append(file_path)
+                else:
+                    modified.append(file_path)
+        return modified, untracked
+    
+    @staticmethod
+    def _status_pygit2(git_repo: 'pygit2.Repository') -> Tuple[List[str], List[str]]:
+        """Fichiers modifiés et non suivis, depuis le status libgit2"""
+        modified = []
+        untracked = []
+        for file_path, flags in git_repo.status().items():
+            if flags & pygit2.GIT_STATUS_IGNORED:
+                continue
+            if flags == pygit2.GIT_STATUS_WT_NEW:
+                untracked.append(file_path)
+            else:
+                modified.append(file_path)
+        return modified, untracked
+
+def _iter_python_files(directory: Path) -> Iterator[Path]:
+    """
+    Parcourt l'arborescence comme Path.rglob('*.py'), avec os.scandir.
+    
+    Le type des entrées vient du DirEntry (déjà lu avec le répertoire) :
+    aucun stat supplémentaire par entrée. Les liens vers des répertoires
+    ne sont pas suivis; les répertoires illisibles sont ignorés.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    subdirs = []
+    for entry in entries:
+        if entry.name.endswith('.py'):
+            yield Path(entry.path)
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+        except OSError:
+            pass
+    for subdir in subdirs:
+        yield from _iter_python_files(subdir)
 
 class ProjectValidator:
     """Validateur de structure de projet"""
@@ -132,8 +217,17 @@ class ProjectValidator:
             '.gitignore'
         ]
         
+        # Une seule lecture de la racine pour tous les contrôles d'existence
+        try:
+            with os.scandir(self.project_root) as it:
+                root_entries = {entry.name: entry for entry in it}
+        except OSError:
+            root_entries = {}
+        
         for file in required_files:
-            if not (self.project_root / file).exists():
+            entry = root_entries.get(file)
+            # Un lien symbolique cassé n'existe pas, comme avec Path.exists()
+            if entry is None or (entry.is_symlink() and not os.path.exists(entry.path)):
                 self.issues.append(f"Fichier requis manquant: {file}")
         
         # Vérifie la structure des répertoires
@@ -144,40 +238,99 @@ class ProjectValidator:
         ]
         
         for dir_name in required_dirs:
-            if not (self.project_root / dir_name).is_dir():
+            entry = root_entries.get(dir_name)
+            if entry is None or not entry.is_dir():
                 self.issues.append(f"Répertoire requis manquant: {dir_name}")
         
         # Vérifie les fichiers Python
-        for py_file in self.project_root.rglob('*.py'):
+        for py_file in _iter_python_files(self.project_root):
             if not self._validate_python_file(py_file):
                 self.issues.append(f"Problèmes dans le fichier: {py_file}")
         
         return len(self.issues) == 0
     
     def _validate_python_file(self, path: Path) -> bool:
-        """Valide un fichier Python individuel"""
+        """
+        Valide un fichier Python individuel.
+        
+        Le fichier est projeté en mémoire et examiné en octets, sans lecture
+        ni décodage complets. Un source non ASCII ou avec des fins de ligne
+        autres que '\n' est relu en texte, comme un fichier ouvert en mode 'r'.
+        """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Vérifie la présence de docstring
-            if not re.search(r'"""[\s\S]*?"""', content):
-                self.issues.append(f"{path}: Docstring manquante")
-            
-            # Vérifie les imports
-            if 'import *' in content:
-                self.issues.append(f"{path}: Wildcard import déconseillé")
-            
-            # Vérifie la longueur des lignes
-            for i, line in enumerate(content.splitlines(), 1):
-                if len(line) > 100:
-                    self.issues.append(
-                        f"{path}:{i}: Ligne trop longue ({len(line)} > 100)"
-                    )
+            with open(path, 'rb') as f:
+                # mmap refuse un fichier vide
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if not _NON_PLAIN_BYTES_RE.search(mm):
+                            self._check_ascii_source(path, mm)
+                            return True
             
+            self._check_source(path, path.read_text(encoding='utf-8'))
             return True
         except Exception:
             return False
+    
+    def _check_ascii_source(self, path: Path, content: mmap.mmap):
+        """Vérifications d'un source ASCII à fins de ligne '\n', sur ses octets"""
+        # Une docstring demande deux triples guillemets successifs
+        start = content.find(b'"""')
+        if start == -1 or content.find(b'"""', start + 3) == -1:
+            self.issues.append(f"{path}: Docstring manquante")
+        
+        if content.find(b'import *') != -1:
+            self.issues.append(f"{path}: Wildcard import déconseillé")
+        
+        # mmap n'a pas de count() : seuls les intervalles précédant une ligne
+        # trop longue sont copiés pour compter leurs fins de ligne
+        line_number = 1
+        position = 0
+        for match in _LONG_LINE_BYTES_RE.finditer(content):
+            line_number += content[position:match.start()].count(b'\n')
+            position = match.start()
+            self.issues.append(
+                f"{path}:{line_number}: Ligne trop longue "
+                f"({match.end() - position} > {MAX_LINE_LENGTH})"
+            )
+    
+    def _check_source(self, path: Path, content: str):
+        """Vérifications d'un source décodé"""
+        # Vérifie la présence de docstring
+        if not _DOCSTRING_RE.search(content):
+            self.issues.append(f"{path}: Docstring manquante")
+        
+        # Vérifie les imports
+        if 'import *' in content:
+            self.issues.append(f"{path}: Wildcard import déconseillé")
+        
+        # Vérifie la longueur des lignes
+        for i, length in self._long_lines(content):
+            self.issues.append(
+                f"{path}:{i}: Ligne trop longue ({length} > {MAX_LINE_LENGTH})"
+            )
+
+    @staticmethod
+    def _long_lines(content: str) -> Iterator[Tuple[int, int]]:
+        """
+        Retourne (numéro, longueur) des lignes de plus de MAX_LINE_LENGTH
+        caractères.
+        
+        Seules les lignes trop longues sont visitées en Python : la regex
+        les trouve et les numéros viennent de str.count entre deux occurrences.
+        """
+        if _OTHER_LINE_BREAKS_RE.search(content):
+            # Séparateurs rares : découpage identique à splitlines
+            for i, line in enumerate(content.splitlines(), 1):
+                if len(line) > MAX_LINE_LENGTH:
+                    yield i, len(line)
+            return
+        
+        line_number = 1
+        position = 0
+        for match in _LONG_LINE_RE.finditer(content):
+            line_number += content.count('\n', position, match.start())
+            position = match.start()
+            yield line_number, match.end() - position
 
 class ProjectTool(ScriptBase[Path, Dict[str, Any]], ScriptHooks):
     """Base pour les outils de gestion de projet"""
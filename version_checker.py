@@ -2,6 +2,7 @@ import argparse
 import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
 import urllib.request
 import urllib.error
@@ -9,29 +10,40 @@ import urllib.error
 ## python version_checker.py --input dependencies.txt --output latest_versions.txt
 
 class PackageVersionChecker:
-    def __init__(self):
+    # Retries on HTTP 429, waiting RETRY_BACKOFF * 2**attempt seconds between tries
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.5
+    
+    def __init__(self, max_workers: int = 16):
         self.pypi_url = "https://pypi.org/pypi/{package}/json"
         self.headers = {
             'User-Agent': 'Python Package Version Checker 1.0'
         }
+        # Number of PyPI requests in flight at once
+        self.max_workers = max_workers
     
     def get_latest_version(self, package: str) -> Optional[str]:
         """Query PyPI API for the latest version of a package."""
-        try:
-            url = self.pypi_url.format(package=package)
-            request = urllib.request.Request(url, headers=self.headers)
-            
-            with urllib.request.urlopen(request, timeout=10) as response:
-                data = json.loads(response.read())
-                return data['info']['version']
-                
-        except urllib.error.HTTPError as e:
-            if e.code == 404:
-                print(f"Package not found: {package}", file=sys.stderr)
-            else:
-                print(f"HTTP error for {package}: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f"Error checking version for {package}: {e}", file=sys.stderr)
+        url = self.pypi_url.format(package=package)
+        request = urllib.request.Request(url, headers=self.headers)
+        
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    data = json.loads(response.read())
+                    return data['info']['version']
+                    
+            except urllib.error.HTTPError as e:
+                if e.code == 429 and attempt < self.MAX_RETRIES:
+                    time.sleep(self.RETRY_BACKOFF * 2 ** attempt)
+                    continue
+                if e.code == 404:
+                    print(f"Package not found: {package}", file=sys.stderr)
+                else:
+                    print(f"HTTP error for {package}: {e}", file=sys.stderr)
+            except Exception as e:
+                print(f"Error checking version for {package}: {e}", file=sys.stderr)
+            break
         
         return None
     
@@ -45,18 +57,22 @@ class PackageVersionChecker:
             return []
     
     def check_versions(self, packages: List[str]) -> Dict[str, Optional[str]]:
-        """Get latest versions for all packages."""
+        """Get latest versions for all packages, querying PyPI concurrently."""
         results = {}
         total = len(packages)
         
         print(f"Checking versions for {total} packages...")
         
-        for i, package in enumerate(packages, 1):
-            print(f"[{i}/{total}] Checking {package}...", end='\r')
-            version = self.get_latest_version(package)
-            results[package] = version
-            # Small delay to be nice to PyPI
-            time.sleep(0.5)
+        # Lookups are network-bound: a bounded thread pool overlaps the round trips
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.get_latest_version, package): package
+                for package in packages
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                package = futures[future]
+                print(f"[{i}/{total}] Checked {package}...", end='\r')
+                results[package] = future.result()
         
         print("\nVersion check complete!")
         return results
@@ -82,9 +98,11 @@ def main():
                       help='Input file containing package names (one per line)')
     parser.add_argument('--output', required=True,
                       help='Output file path for version information')
+    parser.add_argument('--workers', type=int, default=16,
+                      help='Number of concurrent PyPI requests (default: 16)')
     args = parser.parse_args()
     
-    checker = PackageVersionChecker()
+    checker = PackageVersionChecker(max_workers=args.workers)
     
     # Read dependencies
     packages = checker.read_dependencies(args.input)